@@ -1,34 +1,117 @@
 from __future__ import annotations
 
 import asyncio
+import io
 import logging
 import os
-import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from html import unescape
-from typing import Any
+from hashlib import blake2b
+from time import monotonic
+from typing import Any, Coroutine
 from uuid import uuid4
 
 from models.a2a import A2AMessage, Artifact, MessagePart, TaskResult, TaskStatus
-from utils.coin_aliases import resolve_coin_alias
 from utils.gemini_client import analyze_sync
-from utils.market_summary import get_comprehensive_market_summary, format_market_summary_text
 from utils.news_fetcher import fetch_combined_news, fetch_crypto_prices, fetch_forex_rate
 from utils.notifier import send_console_notification, send_webhook_notification
 from utils.prompt_extraction import extract_coin_with_llm
 from utils.redis_client import redis_store
-from utils.session_store import session_store
+from utils.session_store import session_store, text_message_dict
 from utils.technical_analysis import get_technical_summary
 from utils.telex_parser import extract_text_from_telex_message
-from utils.assets import get_coin_id, CRYPTO_LOWER_MAP, get_coin_metadata
+from utils.text_classify import looks_like_summary_request, match_pair, match_symbol_locally, strip_html
+from utils.assets import get_coin_id, get_coin_symbol
 
 logger = logging.getLogger(__name__)
 
-PAIR_RE = re.compile(r"([A-Za-z]{3,5})\s*[/\-]\s*([A-Za-z]{3,5})")
-SYMBOL_RE = re.compile(r"\b([A-Z]{2,5})\b")
+# Seconds an LLM verdict is reused for the same subject and headlines
+ANALYSIS_CACHE_TTL = int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", "120"))
+# Seconds a complete analysis result is reused for repeated queries on the same asset
+RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL_SECONDS", "60"))
+
+# Maximum notifications sent concurrently by the notification worker
+NOTIFICATION_BATCH_SIZE = 16
+# Keys remembered for the notification cooldown before the least recent is forgotten
+MAX_NOTIFIED_KEYS = 10_000
+
+# Fallback string keys checked (in order) on data parts without a "text" value
+DATA_TEXT_KEYS: tuple[str, ...] = ("message", "content")
+# Most text kept from one message; anything past it is truncated so oversized
+# payloads cannot dominate the request
+MAX_MESSAGE_TEXT_CHARS = 4096
+
+
+def _append_text(text_parts: list[str], text: str, budget: int) -> int:
+    """Append ``text`` stripped and cut to ``budget`` chars; return the budget left.
+
+    Blank text is skipped. The cut happens before stripping, so an oversized
+    string is never copied in full.
+    """
+    if budget > 0 and (stripped := text[:budget].strip()):
+        text_parts.append(stripped)
+        budget -= len(stripped)
+    return budget
+
+
+def _collect_item_texts(items: list[Any], text_parts: list[str], budget: int) -> int:
+    """Append text from a list of strings or ``{"text": ...}`` dicts; return the budget left.
+
+    Payloads come straight from JSON, so exact ``type() is`` checks suffice.
+    """
+    for item in items:
+        if budget <= 0:
+            break
+        if type(item) is str:
+            budget = _append_text(text_parts, item, budget)
+        elif type(item) is dict and "text" in item:
+            budget = _append_text(text_parts, str(item["text"]), budget)
+    return budget
+
+
+def _collect_data_text(data: Any, text_parts: list[str], budget: int) -> int:
+    """Append fallback text found in an A2A data part payload; return the budget left."""
+    if type(data) is dict:
+        value = data.get("text")
+        if value:
+            return _append_text(text_parts, str(value), budget)
+        for key in DATA_TEXT_KEYS:
+            value = data.get(key)
+            if type(value) is str:
+                return _append_text(text_parts, value, budget)
+        items = data.get("items")
+        if type(items) is list:
+            return _collect_item_texts(items, text_parts, budget)
+    elif type(data) is list:
+        return _collect_item_texts(data, text_parts, budget)
+    return budget
+
+
+def _task_outcome(task: asyncio.Task[Any]) -> Any:
+    """Return a finished task's result, or its exception as gather(return_exceptions=True) would."""
+    if task.cancelled():
+        return asyncio.CancelledError()
+    return task.exception() or task.result()
 
 
 class MarketAgent:
+    __slots__ = (
+        "notifier_webhook",
+        "notifier_webhook_token",
+        "enable_notifications",
+        "notification_cooldown",
+        "impact_threshold",
+        "last_notified",
+        "contexts",
+        "max_contexts",
+        "_background_tasks",
+        "_llm_executor",
+        "_notification_queue",
+        "_notification_worker",
+        "_inflight",
+    )
+
     def __init__(self, notifier_webhook: str | None = None, notifier_webhook_token: str | None = None, enable_notifications: bool | None = None):
         self.notifier_webhook = notifier_webhook or os.getenv("NOTIFIER_WEBHOOK")
         self.notifier_webhook_token = notifier_webhook_token or os.getenv("NOTIFIER_WEBHOOK_TOKEN")
@@ -37,52 +120,87 @@ class MarketAgent:
             enable_notifications = env_value in {"1", "true", "yes", "on"}
         self.enable_notifications = enable_notifications
         self.notification_cooldown = int(os.getenv("NOTIFICATION_COOLDOWN_SECONDS", "900"))
-        self.last_notified: dict[str, float] = {}
-        
-        # Context storage (in-memory for fast lookup, like MoodMatch)
-        self.contexts: dict[str, list[A2AMessage]] = {}
+        self.impact_threshold = float(os.getenv("ANALYSIS_IMPACT_THRESHOLD", "0.5"))
+        # Monotonic time of the last notification per key, bounded LRU
+        self.last_notified: OrderedDict[str, float] = OrderedDict()
+        
+        # Context storage (in-memory for fast lookup, like MoodMatch). Bounded LRU;
+        # the durable copy of each conversation lives in session_store (Redis).
+        self.contexts: OrderedDict[str, list[A2AMessage]] = OrderedDict()
+        self.max_contexts = int(os.getenv("MAX_CONTEXTS", "1024"))
+        # Strong references to fire-and-forget tasks so they are not garbage collected
+        self._background_tasks: set[asyncio.Task[Any]] = set()
+        # Dedicated pool for blocking Gemini calls so they don't queue behind other executor work
+        self._llm_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("LLM_MAX_CONCURRENCY", "20")),
+            thread_name_prefix="llm",
+        )
+        # Bounded queue drained by a single worker; notifications are dropped when it is full
+        self._notification_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(
+            maxsize=int(os.getenv("NOTIFICATION_QUEUE_SIZE", "256"))
+        )
+        self._notification_worker: asyncio.Task[None] | None = None
+        # In-flight analyses keyed by (pair, symbol), so concurrent duplicate requests share one run
+        self._inflight: dict[tuple[str | None, str | None], asyncio.Task[Any]] = {}
+
+    async def close(self) -> None:
+        """Release resources held by the agent."""
+        # Let pending background writes (agent replies, caches) finish before Redis closes
+        if self._background_tasks:
+            _, pending = await asyncio.wait(tuple(self._background_tasks), timeout=5.0)
+            if pending:
+                logger.warning(f"Dropping {len(pending)} background tasks on shutdown")
+        if self._notification_worker is not None:
+            # Give queued notifications a chance to go out before stopping the worker
+            if not self._notification_worker.done():
+                try:
+                    await asyncio.wait_for(self._notification_queue.join(), timeout=5.0)
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        f"Dropping {self._notification_queue.qsize()} queued notifications on shutdown"
+                    )
+            self._notification_worker.cancel()
+            try:
+                await self._notification_worker
+            except asyncio.CancelledError:
+                pass
+            self._notification_worker = None
+        self._llm_executor.shutdown(wait=False, cancel_futures=True)
 
     @staticmethod
     def _strip_html(text: str) -> str:
         """Remove HTML tags and decode entities."""
-        text = re.sub(r'<[^>]+>', '', text)
-        text = unescape(text)
-        text = ' '.join(text.split())
-        return text
+        return strip_html(text)
 
     @staticmethod
     def _extract_text_from_message(message: A2AMessage) -> str:
-        """Extract text from A2A message with multiple fallback strategies."""
+        """Extract text from A2A message with multiple fallback strategies.
+
+        At most ``MAX_MESSAGE_TEXT_CHARS`` of text are kept for the whole message.
+        """
         text_parts: list[str] = []
-        
+        data_texts: list[str] = []
+        # Chars left for whichever list ends up in the result
+        budget = MAX_MESSAGE_TEXT_CHARS
+
         for part in message.parts:
-            if part.kind == "text" and part.text and part.text.strip():
-                text_parts.append(part.text.strip())
-        
-        if not text_parts:
-            for part in message.parts:
-                if part.kind == "data" and part.data:
-                    if isinstance(part.data, dict):
-                        if "text" in part.data and part.data["text"]:
-                            text_parts.append(str(part.data["text"]).strip())
-                        elif "message" in part.data and isinstance(part.data["message"], str):
-                            text_parts.append(part.data["message"].strip())
-                        elif "content" in part.data and isinstance(part.data["content"], str):
-                            text_parts.append(part.data["content"].strip())
-                        elif "items" in part.data and isinstance(part.data["items"], list):
-                            for item in part.data["items"]:
-                                if isinstance(item, str) and item.strip():
-                                    text_parts.append(item.strip())
-                                elif isinstance(item, dict) and "text" in item:
-                                    text_parts.append(str(item["text"]).strip())
-                    elif isinstance(part.data, list):
-                        for item in part.data:
-                            if isinstance(item, str) and item.strip():
-                                text_parts.append(item.strip())
-                            elif isinstance(item, dict) and "text" in item:
-                                text_parts.append(str(item["text"]).strip())
-        
-        combined_text = " ".join(text_parts)
+            if part.kind == "text":
+                # Edges are trimmed by strip_html's whitespace normalization, so only
+                # blank parts need skipping here
+                text = part.text
+                if text and not text.isspace():
+                    if not text_parts:
+                        # Data texts are discarded once a text part exists
+                        budget = MAX_MESSAGE_TEXT_CHARS
+                    if budget > 0:
+                        text = text[:budget]
+                        text_parts.append(text)
+                        budget -= len(text)
+            elif part.kind == "data" and part.data and not text_parts:
+                # Data parts only matter while no text part has been found
+                budget = _collect_data_text(part.data, data_texts, budget)
+
+        combined_text = " ".join(text_parts or data_texts)
         
         if combined_text:
             combined_text = MarketAgent._strip_html(combined_text)
@@ -97,15 +215,20 @@ class MarketAgent:
         config: dict[str, Any] | None = None,
     ) -> TaskResult:
         """Main handler invoked by JSON-RPC endpoint. Accepts one or more messages."""
+        # Single clock read reused for ids, fallback timestamps and notification cooldown
         now = datetime.now(timezone.utc)
-        context_id = context_id or f"context-{int(now.timestamp())}"
-        task_id = task_id or f"task-{int(now.timestamp())}"
+        now_ts = now.timestamp()
+        now_iso = now.isoformat().replace("+00:00", "Z")
+        context_id = context_id or f"context-{int(now_ts)}"
+        task_id = task_id or f"task-{int(now_ts)}"
         if not messages:
             raise ValueError("No messages provided")
 
         user_msg = messages[-1]
         
         text: str | None = None
+        # Text extracted from user_msg itself, reused for the history entry
+        message_text: str | None = None
         conversation_history: list[str] = []
         extraction_debug: dict[str, Any] = {}
         
@@ -115,107 +238,201 @@ class MarketAgent:
                 logger.info(f"Telex extraction: {extraction_debug.get('source')}, history: {len(conversation_history)} msgs")
         
         if not text:
-            text = self._extract_text_from_message(user_msg)
+            text = message_text = self._extract_text_from_message(user_msg)
             extraction_debug = {"source": "fallback_message_extraction"}
         
         if not text or not text.strip():
             raise ValueError("No analyzable text found in message. Please provide a query with cryptocurrency symbol, name, or forex pair (e.g., 'BTC price', 'Bitcoin analysis', 'EUR/USD rate').")
 
-        if conversation_history and context_id:
-            try:
-                for hist_text in conversation_history[-5:]:  # Store last 5 for context
-                    hist_msg = A2AMessage(
-                        role="user",
-                        parts=[MessagePart(kind="text", text=hist_text)]
-                    )
-                    await session_store.append_message(context_id, hist_msg)
-            except Exception as e:
-                logger.warning(f"Failed to store conversation history: {e}")
-        
-        try:
-            await session_store.append_message(context_id, user_msg)
-        except Exception as e:
-            logger.warning(f"Failed to store user message: {e}")
+        # Session writes are independent of market data, so they run alongside the fetches
+        store_incoming = asyncio.create_task(
+            self._store_incoming_messages(context_id, conversation_history, user_msg)
+        )
 
         if self._is_market_summary_request(text):
+            await store_incoming
             return await self._handle_market_summary(messages, context_id, task_id)
 
         pair = self._extract_pair(text)
-        symbol = self._extract_symbol(text)  # coingecko id, e.g. 'bitcoin'
+        symbol = await self._extract_symbol(text)  # coingecko id, e.g. 'bitcoin'
 
         # Derive a display ticker (e.g., 'BTC') from local metadata for nicer output
-        display_ticker: str | None = None
-        if symbol:
-            try:
-                meta_list = get_coin_metadata()
-                id_to_symbol = {m["id"]: m["symbol"].upper() for m in meta_list}
-                display_ticker = id_to_symbol.get(symbol, symbol.upper())
-            except Exception:
-                display_ticker = symbol.upper()
+        display_ticker = get_coin_symbol(symbol) if symbol else None
 
-        # Parallel fetch all data to reduce latency
-        fetch_tasks = []
+        # Concurrent requests for the same asset share one fetch + LLM run
+        key = (pair or symbol or "market").upper()
+        inflight_key = (pair, symbol)
+        analysis_task = self._inflight.get(inflight_key)
+        if analysis_task is None:
+            analysis_task = asyncio.create_task(
+                self._run_analysis(key, pair, symbol, display_ticker, now_iso)
+            )
+            self._inflight[inflight_key] = analysis_task
+            analysis_task.add_done_callback(
+                lambda task, inflight_key=inflight_key: self._forget_inflight(inflight_key, task)
+            )
+        # Shield the shared task so one cancelled caller does not cancel the others
+        _, (analysis, price_snapshot, technical_data, relevant, error_messages) = await asyncio.gather(
+            store_incoming, asyncio.shield(analysis_task)
+        )
+
+        confidence = float(analysis.get("confidence", 0.0) or 0.0)
+        reasons = analysis.get("reasoning") or []
+        direction = analysis.get("direction", "neutral")
         
-        if pair:
-            fetch_tasks.append(("forex", fetch_forex_rate(pair)))
+        # Callers that only need a short status line can opt out of the Markdown report
+        text_format = config.get("text_format", "markdown") if isinstance(config, dict) else "markdown"
+        if text_format == "none":
+            agent_text = f"{key}: {direction} ({confidence:.0%})"
+        else:
+            agent_text = self._format_analysis_message(
+                key=key,
+                direction=direction,
+                confidence=confidence,
+                reasons=reasons,
+                price_snapshot=price_snapshot,
+                technical_data=technical_data,
+                news=relevant[:3],
+                pair=pair,
+                symbol=display_ticker,
+                error_messages=error_messages
+            )
         
-        if symbol:
-            # Fetch prices by ticker for human-friendly keys (BTC -> price)
-            ticker_to_fetch = display_ticker or symbol.upper()
-            fetch_tasks.append(("crypto_price", fetch_crypto_prices([ticker_to_fetch])))
-            fetch_tasks.append(("technical", get_technical_summary(symbol)))
+        # Response message, artifact and status message all carry the same text part.
+        # Everything below is built from trusted values, so pydantic validation is skipped.
+        text_part = MessagePart.model_construct(kind="text", text=agent_text)
         
-        # Always fetch news in parallel
-        fetch_tasks.append(("news", fetch_combined_news(limit=5)))  # Reduced from 10 to 5
-        
-        # Execute all fetches in parallel
-        results = {}
-        if fetch_tasks:
-            task_results = await asyncio.gather(
-                *[task for _, task in fetch_tasks],
-                return_exceptions=True
+        # Step 1: Build response message (for conversation history display)
+        response_message = A2AMessage.model_construct(
+            role="agent",
+            parts=[text_part],
+            messageId=uuid4().hex,
+            taskId=None,  # Set to None in history like working agent
+            metadata=None  # Set to None in history like working agent
+        )
+
+        # Step 2: Create artifacts (match working agent format)
+        # Working agents use ONE artifact with kind="text" containing the response
+        artifacts: list[Artifact] = [
+            Artifact.model_construct(
+                name="assistantResponse",
+                parts=[text_part]
             )
-            for i, (name, _) in enumerate(fetch_tasks):
-                results[name] = task_results[i]
+        ]
+
+        # Step 3: Build conversation history (includes response_message)
+        history = self._build_history(messages, response_message, message_text)
+        
+        # Step 4: Store context (like MoodMatch)
+        self._remember_context(context_id, history)
+        
+        # Also persist to Redis for durability (off the response path)
+        self._run_in_background(self._store_agent_message(context_id, response_message))
+
+        # Step 5: Create status message (A2A protocol compliance)
+        # The status message should contain the SAME text as the artifact
+        status_state = "completed"
+        if (pair and price_snapshot.get("pair", {}).get("rate") is None) and (not symbol):
+            status_state = "failed"
+        
+        status_message = A2AMessage.model_construct(
+            role="agent",
+            parts=[text_part],  # Same text as artifact
+            messageId=uuid4().hex,
+            taskId=None,  # Set to None like working agent
+            metadata=None  # Set to None like working agent
+        )
+
+        task_status = TaskStatus.model_construct(state=status_state, message=status_message)
+
+        # Step 6: Create successful task result
+        result = TaskResult.model_construct(
+            taskId=task_id,
+            contextId=context_id,
+            status=task_status,
+            artifacts=artifacts,
+            history=history,
+        )
+        # Set user's messageId for result.id field (Telex compatibility)
+        result._user_message_id = user_msg.messageId
+        return result
+
+    async def _run_analysis(
+        self,
+        key: str,
+        pair: str | None,
+        symbol: str | None,
+        display_ticker: str | None,
+        now_iso: str,
+    ) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any], list[dict[str, Any]], list[str]]:
+        """Fetch market data, run the LLM analysis, then cache and notify.
+
+        Returns ``(analysis, price_snapshot, technical_data, relevant_news,
+        error_messages)``. Results may be shared by coalesced callers, so
+        callers must treat them as read-only.
+        """
+        # Repeated queries (retries, refreshes) reuse a recent complete result
+        result_key = f"analysis_result:{pair}:{symbol}"
+        cached = await self._get_cached(result_key)
+        if cached is not None:
+            return cached["analysis"], cached["price_snapshot"], cached["technical_data"], cached["news"], []
+
+        # Parallel fetch all data to reduce latency. A plain gather rather
+        # than a TaskGroup, so one failing source does not cancel the others.
+        ticker_to_fetch = (display_ticker or symbol.upper()) if symbol else None
+        forex_task = asyncio.create_task(fetch_forex_rate(pair)) if pair else None
+        # Fetch prices by ticker for human-friendly keys (BTC -> price)
+        crypto_task = asyncio.create_task(fetch_crypto_prices([ticker_to_fetch])) if symbol else None
+        technical_task = asyncio.create_task(get_technical_summary(symbol)) if symbol else None
+        # Always fetch news in parallel
+        news_task = asyncio.create_task(fetch_combined_news(limit=5))  # Reduced from 10 to 5
+        await asyncio.gather(
+            *(
+                task
+                for task in (forex_task, crypto_task, technical_task, news_task)
+                if task is not None
+            ),
+            return_exceptions=True,
+        )
         
         # Process results
         price_snapshot: dict[str, Any] = {}
         technical_data: dict[str, Any] = {}
         error_messages: list[str] = []
+        # Technicals are optional, so a failed fetch is not reported but keeps the result uncached
+        technical_failed = False
         
-        if pair and "forex" in results:
-            result = results["forex"]
+        if forex_task is not None:
+            result = _task_outcome(forex_task)
             if isinstance(result, Exception):
                 price_snapshot["pair"] = {"pair": pair, "rate": None}
                 error_messages.append(f"Unable to fetch forex rate for {pair}.")
             else:
                 price_snapshot["pair"] = result
                 
-        if symbol:
-            if "crypto_price" in results:
-                result = results["crypto_price"]
-                if isinstance(result, Exception):
-                    ticker_to_fetch = display_ticker or symbol.upper()
-                    price_snapshot["crypto"] = {ticker_to_fetch: None}
-                    error_messages.append(f"Unable to fetch price data for {ticker_to_fetch}.")
-                else:
-                    price_snapshot["crypto"] = result
-                    
-            if "technical" in results:
-                result = results["technical"]
-                if not isinstance(result, Exception):
-                    technical_data = result
-
-        combined_news = results.get("news", [])
+        if crypto_task is not None:
+            result = _task_outcome(crypto_task)
+            if isinstance(result, Exception):
+                price_snapshot["crypto"] = {ticker_to_fetch: None}
+                error_messages.append(f"Unable to fetch price data for {ticker_to_fetch}.")
+            else:
+                price_snapshot["crypto"] = result
+                
+        if technical_task is not None:
+            result = _task_outcome(technical_task)
+            if isinstance(result, Exception):
+                technical_failed = True
+            else:
+                technical_data = result
+                technical_failed = "error" in result
+
+        combined_news = _task_outcome(news_task)
         if isinstance(combined_news, Exception):
             combined_news = []
 
-        ticker_for_news = (display_ticker or symbol.upper()) if symbol else None
-        relevant = self._filter_relevant_news(combined_news, pair, ticker_for_news)
-        news_summary = (
-            "\n".join(f"• {item.get('title')} ({item.get('source')})" for item in relevant[:5])
-            or "No recent headlines found."
-        )
+        relevant = self._filter_relevant_news(combined_news, pair, ticker_to_fetch)
+        headlines = [f"• {item.get('title')} ({item.get('source')})" for item in relevant[:5]]
+        news_summary = "\n".join(headlines) if headlines else "No recent headlines found."
         
         if technical_data:
             tech_summary = (
@@ -227,47 +444,46 @@ class MarketAgent:
             )
             news_summary += tech_summary
 
-        loop = asyncio.get_running_loop()
         subject = pair or symbol or "market"
-        
-        # Add timeout to prevent hanging on slow LLM responses
-        try:
-            analysis_result = await asyncio.wait_for(
-                loop.run_in_executor(None, analyze_sync, subject, price_snapshot, news_summary),
-                timeout=25.0  # 25 second max for LLM analysis
-            )
-            analysis_data = self._extract_analysis_data(analysis_result)
-            raw_analysis = analysis_data.get("analysis", {})
-            analysis = dict(raw_analysis) if isinstance(raw_analysis, dict) else {}
-            analysis_ts = analysis_data.get("timestamp") or datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-            analysis["ts"] = analysis_ts
-        except asyncio.TimeoutError:
-            logger.warning(f"Gemini analysis timed out for {subject}")
-            # Fallback to basic analysis without LLM
-            analysis = {
-                "direction": "neutral",
-                "confidence": 0.5,
-                "impact_score": 0.0,
-                "reasoning": ["Analysis timed out - using fallback"],
-                "timeframe": "short-term",
-                "ts": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-            }
+        # Identical subject + headlines within the TTL reuse the previous LLM verdict
+        cache_key = f"llm_analysis:{key}:{blake2b(news_summary.encode(), digest_size=8).hexdigest()}"
+        analysis = await self._get_cached(cache_key)
+        cache_analysis = False
+        # Fallback verdicts must not be reused, neither on their own nor in the result cache
+        cacheable = True
+        if analysis is None:
+            analysis, cacheable = await self._analyze_with_llm(subject, price_snapshot, news_summary, now_iso)
+            if analysis is not None:
+                cache_analysis = cacheable
+            else:
+                # Fallback to basic analysis without LLM
+                analysis = {
+                    "direction": "neutral",
+                    "confidence": 0.5,
+                    "impact_score": 0.0,
+                    "reasoning": ["Analysis timed out - using fallback"],
+                    "timeframe": "short-term",
+                    "ts": now_iso
+                }
 
-        key = (pair or symbol or "market").upper()
+        latest = {"analysis": analysis, "news": relevant, "price_snapshot": price_snapshot}
         try:
-            await redis_store.set_latest_analysis(
-                key,
-                {"analysis": analysis, "news": relevant, "price_snapshot": price_snapshot},
-                ex=3600,
-            )
+            if cache_analysis:
+                # Fresh LLM verdict: write it to the cache alongside the latest analysis
+                await redis_store.set_latest_analysis_and_cache(
+                    key, latest, cache_key, analysis, ex=3600, cache_ex=ANALYSIS_CACHE_TTL
+                )
+            else:
+                await redis_store.set_latest_analysis(key, latest, ex=3600)
         except Exception as e:
             logger.warning(f"Failed to store analysis in Redis: {e}")
 
         impact = float(analysis.get("impact_score", 0.0) or 0.0)
-        if self.enable_notifications and abs(impact) >= float(os.getenv("ANALYSIS_IMPACT_THRESHOLD", "0.5")):
+        if self.enable_notifications and abs(impact) >= self.impact_threshold:
+            # Monotonic clock, so wall-clock adjustments cannot skip or repeat a cooldown
+            now_mono = monotonic()
             last = self.last_notified.get(key)
-            now_ts = datetime.now(timezone.utc).timestamp()
-            if not last or (now_ts - last) >= self.notification_cooldown:
+            if last is None or (now_mono - last) >= self.notification_cooldown:
                 payload = {
                     "key": key,
                     "impact": impact,
@@ -275,89 +491,156 @@ class MarketAgent:
                     "news": relevant[:3],
                     "price_snapshot": price_snapshot,
                 }
-                asyncio.create_task(send_console_notification(str(payload)))
-                if self.notifier_webhook:
-                    asyncio.create_task(send_webhook_notification(
-                        self.notifier_webhook, 
-                        payload, 
-                        token=self.notifier_webhook_token
-                    ))
-                self.last_notified[key] = now_ts
+                self._enqueue_notification(payload)
+                self.last_notified[key] = now_mono
+                self.last_notified.move_to_end(key)
+                if len(self.last_notified) > MAX_NOTIFIED_KEYS:
+                    self.last_notified.popitem(last=False)
+
+        # Only complete results are reused; partial ones should be retried
+        if cacheable and not error_messages and not technical_failed:
+            self._run_in_background(
+                self._set_cache(
+                    result_key,
+                    {
+                        "analysis": analysis,
+                        "price_snapshot": price_snapshot,
+                        "technical_data": technical_data,
+                        "news": relevant,
+                    },
+                    RESULT_CACHE_TTL,
+                )
+            )
 
-        confidence = float(analysis.get("confidence", 0.0) or 0.0)
-        reasons = analysis.get("reasoning") or []
-        direction = analysis.get("direction", "neutral")
-        
-        agent_text = self._format_analysis_message(
-            key=key,
-            direction=direction,
-            confidence=confidence,
-            reasons=reasons,
-            price_snapshot=price_snapshot,
-            technical_data=technical_data,
-            news=relevant[:3],
-            pair=pair,
-            symbol=display_ticker,
-            error_messages=error_messages
-        )
-        
-        # Step 1: Build response message (for conversation history display)
-        response_message = A2AMessage(
-            role="agent",
-            parts=[MessagePart(kind="text", text=agent_text)],
-            messageId=str(uuid4()),
-            taskId=None,  # Set to None in history like working agent
-            metadata=None  # Set to None in history like working agent
-        )
+        return analysis, price_snapshot, technical_data, relevant, error_messages
 
-        # Step 2: Create artifacts (match working agent format)
-        # Working agents use ONE artifact with kind="text" containing the response
-        artifacts: list[Artifact] = [
-            Artifact(
-                name="assistantResponse",
-                parts=[MessagePart(kind="text", text=agent_text)]
-            )
-        ]
+    async def _get_cached(self, cache_key: str) -> dict[str, Any] | None:
+        """Return a cached dict payload, or None on miss or Redis failure."""
+        try:
+            cached = await redis_store.get_cache(cache_key)
+        except Exception as e:
+            logger.debug(f"Analysis cache lookup failed: {e}")
+            return None
+        return cached if isinstance(cached, dict) else None
 
-        # Step 3: Build conversation history (includes response_message)
-        history = self._build_history(messages, response_message)
-        
-        # Step 4: Store context (like MoodMatch)
+    async def _set_cache(self, cache_key: str, value: dict[str, Any], ex: int) -> None:
+        """Cache a dict payload, logging failures."""
+        try:
+            await redis_store.set_cache(cache_key, value, ex=ex)
+        except Exception as e:
+            logger.debug(f"Failed to cache {cache_key}: {e}")
+
+    async def _analyze_with_llm(
+        self,
+        subject: str,
+        price_snapshot: dict[str, Any],
+        news_summary: str,
+        now_iso: str,
+    ) -> tuple[dict[str, Any] | None, bool]:
+        """Run the Gemini analysis off the event loop.
+
+        Returns ``(analysis, cacheable)``; ``analysis`` is None when the call
+        times out, and ``cacheable`` is False for timeouts and fallback verdicts.
+        """
+        loop = asyncio.get_running_loop()
+        # Add timeout to prevent hanging on slow LLM responses
+        try:
+            analysis_result = await asyncio.wait_for(
+                loop.run_in_executor(self._llm_executor, analyze_sync, subject, price_snapshot, news_summary),
+                timeout=25.0  # 25 second max for LLM analysis
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Gemini analysis timed out for {subject}")
+            return None, False
+        analysis_data = self._extract_analysis_data(analysis_result)
+        raw_analysis = analysis_data.get("analysis")
+        # analyze_sync builds a fresh dict per call, so it is safe to annotate in place
+        analysis = raw_analysis if isinstance(raw_analysis, dict) else {}
+        analysis["ts"] = analysis_data.get("timestamp") or now_iso
+        return analysis, not analysis_data.get("fallback", False)
+
+    def _forget_inflight(self, inflight_key: tuple[str | None, str | None], task: asyncio.Task[Any]) -> None:
+        """Drop a finished analysis from the in-flight map if it is still the current one."""
+        if self._inflight.get(inflight_key) is task:
+            del self._inflight[inflight_key]
+
+    def _remember_context(self, context_id: str, history: list[A2AMessage]) -> None:
+        """Cache a conversation's history, evicting the least recently used ones."""
         self.contexts[context_id] = history
-        
-        # Also persist to Redis for durability
+        self.contexts.move_to_end(context_id)
+        while len(self.contexts) > self.max_contexts:
+            self.contexts.popitem(last=False)
+
+    def _run_in_background(self, coro: Coroutine[Any, Any, None]) -> None:
+        """Schedule a fire-and-forget coroutine, keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _store_agent_message(self, context_id: str, message: A2AMessage) -> None:
+        """Persist the agent's reply to session history, logging failures."""
         try:
-            await session_store.append_message(context_id, response_message)
+            await session_store.append_message(context_id, message)
         except Exception as e:
             logger.warning(f"Failed to store agent message: {e}")
 
-        # Step 5: Create status message (A2A protocol compliance)
-        # The status message should contain the SAME text as the artifact
-        status_state = "completed"
-        if (pair and price_snapshot.get("pair", {}).get("rate") is None) and (not symbol):
-            status_state = "failed"
-        
-        status_message = A2AMessage(
-            role="agent",
-            parts=[MessagePart(kind="text", text=agent_text)],  # Same text as artifact
-            messageId=str(uuid4()),
-            taskId=None,  # Set to None like working agent
-            metadata=None  # Set to None like working agent
-        )
+    def _enqueue_notification(self, payload: dict[str, Any]) -> None:
+        """Queue a notification for the background worker, starting it on first use.
 
-        task_status = TaskStatus(state=status_state, message=status_message)
+        When the queue is full the oldest pending notification is dropped,
+        so the newest market moves are the ones that go out.
+        """
+        queue = self._notification_queue
+        if queue.full():
+            dropped = queue.get_nowait()
+            queue.task_done()
+            logger.warning(f"Notification queue full, dropping notification for {dropped.get('key')}")
+        queue.put_nowait(payload)
+        if self._notification_worker is None or self._notification_worker.done():
+            self._notification_worker = asyncio.create_task(self._run_notification_worker())
+
+    async def _run_notification_worker(self) -> None:
+        """Drain the notification queue in batches."""
+        while True:
+            batch = [await self._notification_queue.get()]
+            while len(batch) < NOTIFICATION_BATCH_SIZE and not self._notification_queue.empty():
+                batch.append(self._notification_queue.get_nowait())
+            try:
+                await asyncio.gather(*(self._send_notifications(payload) for payload in batch))
+            finally:
+                for _ in batch:
+                    self._notification_queue.task_done()
+
+    async def _send_notifications(self, payload: dict[str, Any]) -> None:
+        """Send console and webhook notifications concurrently."""
+        sends = [send_console_notification(payload)]
+        if self.notifier_webhook:
+            sends.append(send_webhook_notification(
+                self.notifier_webhook, 
+                payload, 
+                token=self.notifier_webhook_token
+            ))
+        for result in await asyncio.gather(*sends, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to send notification for {payload.get('key')}: {result}")
 
-        # Step 6: Create successful task result
-        result = TaskResult(
-            taskId=task_id,
-            contextId=context_id,
-            status=task_status,
-            artifacts=artifacts,
-            history=history,
-        )
-        # Set user's messageId for result.id field (Telex compatibility)
-        result._user_message_id = user_msg.messageId
-        return result
+    async def _store_incoming_messages(
+        self,
+        context_id: str,
+        conversation_history: list[str],
+        user_msg: A2AMessage,
+    ) -> None:
+        """Persist Telex conversation history and the incoming user message in one write."""
+        to_store: list[A2AMessage | dict[str, Any]] = []
+        if conversation_history and context_id:
+            # Store last 5 for context
+            to_store.extend(text_message_dict("user", hist_text) for hist_text in conversation_history[-5:])
+        to_store.append(user_msg)
+        
+        try:
+            await session_store.append_messages(context_id, to_store)
+        except Exception as e:
+            logger.warning(f"Failed to store incoming messages: {e}")
 
     def _extract_pair(self, text: str) -> str | None:
         """Extract forex pair from text.
@@ -366,49 +649,9 @@ class MarketAgent:
         For 6-letter patterns like EURUSD, only accept if it looks like a valid forex pair
         (both halves are common currency codes, not random words like LATEST).
         """
-        text_lower = text.lower()
-        natural_language_pairs = {
-            "euro dollar": "EUR/USD",
-            "euro usd": "EUR/USD",
-            "pound dollar": "GBP/USD",
-            "pound usd": "GBP/USD",
-            "dollar yen": "USD/JPY",
-            "usd yen": "USD/JPY",
-            "aussie dollar": "AUD/USD",
-            "aud usd": "AUD/USD",
-            "euro pound": "EUR/GBP",
-            "euro yen": "EUR/JPY",
-            "dollar cad": "USD/CAD",
-            "dollar canadian": "USD/CAD",
-        }
-        
-        for phrase, pair in natural_language_pairs.items():
-            if phrase in text_lower:
-                logger.info(f"[Natural language] Matched '{phrase}' -> '{pair}'")
-                return pair
-        
-        m = PAIR_RE.search(text)
-        if m:
-            a, b = m.groups()
-            return f"{a.upper()}/{b.upper()}"
-        
-        valid_currencies = {
-            "USD", "EUR", "GBP", "JPY", "AUD", "CAD", "CHF", "NZD", 
-            "CNY", "SEK", "NOK", "DKK", "SGD", "HKD", "KRW", "INR",
-            "MXN", "ZAR", "TRY", "BRL", "RUB", "PLN", "THB", "MYR"
-        }
-        
-        m2 = re.search(r"\b([A-Za-z]{6})\b", text)
-        if m2:
-            s = m2.group(1).upper()
-            first_half = s[:3]
-            second_half = s[3:]
-            if first_half in valid_currencies and second_half in valid_currencies:
-                return f"{first_half}/{second_half}"
-        
-        return None
+        return match_pair(text)
 
-    def _extract_symbol(self, text: str) -> str | None:
+    async def _extract_symbol(self, text: str) -> str | None:
         """Extract cryptocurrency symbol using hierarchical matching strategies.
 
         Priority order:
@@ -419,68 +662,16 @@ class MarketAgent:
 
         Returns the CoinGecko ID (e.g., "bitcoin") for compatibility with price APIs.
         """
-        text_upper = text.upper()
-        text_lower = text.lower()
-        
-        # Skip common English words to avoid false matches
-        skip_words = {
-            "analyze", "check", "what", "about", "tell", "me", "price", "of", "the",
-            "is", "are", "was", "were", "have", "has", "had", "do", "does", "did",
-            "will", "would", "should", "could", "can", "may", "might", "must",
-            "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "from",
-            "with", "by", "as", "this", "that", "these", "those", "it", "its",
-            "show", "get", "give", "take", "make", "go", "come", "see", "know",
-            "think", "say", "tell", "ask", "use", "find", "want", "need", "try"
-        }
-        
-        # Priority 1: Direct match using centralized alias table (very fast)
-        words = text_upper.replace(",", " ").replace(".", " ").split()
-        for word in words:
-            if word in skip_words or len(word) < 2:
-                continue
-
-            # Use assets.get_coin_id to resolve common aliases/symbols/names
-            coin_id = get_coin_id(word)
-            if coin_id:
-                logger.info(f"[Direct Match] '{word}' -> '{coin_id}'")
-                return coin_id
-        
-        # Priority 2: Check for full coin names in text (FAST)
-        for key, coin_id in CRYPTO_LOWER_MAP.items():
-            if len(key) > 3 and key in text_lower:  # Full names like "bitcoin", "ethereum"
-                logger.info(f"[Name Match] Found '{key}' -> '{coin_id}'")
-                return coin_id
-        
-        # Priority 3: Fallback hardcoded common names (FAST)
-        crypto_map = {
-            "bitcoin": "bitcoin",
-            "ethereum": "ethereum",
-            "litecoin": "litecoin",
-            "ripple": "ripple",
-            "dogecoin": "dogecoin",
-            "cardano": "cardano",
-            "polkadot": "polkadot",
-            "solana": "solana",
-            "polygon": "matic-network",
-            "chainlink": "chainlink",
-            "avalanche": "avalanche-2",
-            "uniswap": "uniswap",
-            "cosmos": "cosmos",
-            "binance coin": "binancecoin",
-            "bnb": "binancecoin",
-            "tether": "tether",
-            "usdc": "usd-coin",
-        }
-        
-        for name, coin_id in crypto_map.items():
-            if name in text_lower:
-                logger.info(f"[Fallback] Matched '{name}' -> '{coin_id}'")
-                return coin_id
-        
+        coin_id = match_symbol_locally(text)
+        if coin_id:
+            return coin_id
+
         # Priority 4: ONLY use LLM if nothing matched (SLOW, last resort)
         # This is expensive and should rarely be needed with the expanded map
-        logger.debug(f"No quick match found, trying LLM extraction (slow)...")
-        coin_query = extract_coin_with_llm(text)
+        # The extractor makes a blocking Gemini call, so it runs on the LLM pool
+        logger.debug("No quick match found, trying LLM extraction (slow)...")
+        loop = asyncio.get_running_loop()
+        coin_query = await loop.run_in_executor(self._llm_executor, extract_coin_with_llm, text)
         if coin_query:
             # Filter out garbage responses
             if "TICKER" in coin_query.upper() or len(coin_query) > 20 or "-" in coin_query:
@@ -504,30 +695,41 @@ class MarketAgent:
         pair: str | None,
         ticker: str | None,
     ) -> list[dict[str, Any]]:
+        """Keep news items mentioning the ticker (or the pair's base currency).
+
+        ``pair`` and ``ticker`` are expected to be uppercase already, as
+        produced by ``_extract_pair`` and the display-ticker lookup. Each
+        item's text fields are uppercased at most once, and only when the
+        cheaper checks before them miss. Items are not annotated because
+        they may be shared with the news cache.
+        """
         if not news:
             return []
         if ticker:
-            upper_ticker = ticker.upper()
             return [
-                n
-                for n in news
-                if upper_ticker in (n.get("symbols") or []) or upper_ticker in (n.get("title") or "").upper()
+                n for n in news
+                if ticker in (n.get("symbols") or ())
+                or ticker in (n.get("title") or "").upper()
             ]
         if pair:
-            base = pair.split("/")[0].upper()
+            base = pair.partition("/")[0]
             return [
-                n
-                for n in news
-                if base in (n.get("title") or "").upper() or base in (n.get("source") or "").upper()
+                n for n in news
+                if base in (n.get("title") or "").upper()
+                or base in (n.get("source") or "").upper()
             ]
         return news
 
     def _build_history(
         self,
         incoming_messages: list[A2AMessage],
-        agent_message: A2AMessage
+        agent_message: A2AMessage,
+        user_text: str | None = None,
     ) -> list[A2AMessage]:
         """Build conversation history.
+
+        ``user_text`` is the already-extracted text of the last incoming
+        message, when the caller has it.
         """
         history = []
         
@@ -535,13 +737,14 @@ class MarketAgent:
         if incoming_messages:
             last_user_msg = incoming_messages[-1]
             # Extract just the text from the user message
-            user_text = self._extract_text_from_message(last_user_msg)
+            if user_text is None:
+                user_text = self._extract_text_from_message(last_user_msg)
             
             # Create simplified user message for history
-            clean_user_msg = A2AMessage(
+            clean_user_msg = A2AMessage.model_construct(
                 role="user",
-                parts=[MessagePart(kind="text", text=user_text)],
-                messageId=str(uuid4()),
+                parts=[MessagePart.model_construct(kind="text", text=user_text)],
+                messageId=uuid4().hex,
                 taskId=None,
                 metadata=None
             )
@@ -564,34 +767,7 @@ class MarketAgent:
 
     def _is_market_summary_request(self, text: str) -> bool:
         """Detect if the request is asking for a market summary/overview."""
-        text_lower = text.lower()
-        
-        # Keywords that indicate market summary requests
-        summary_keywords = [
-            "summarize",
-            "summary",
-            "overview",
-            "what's happening",
-            "market update",
-            "today's market",
-            "movements today",
-            "market movements",
-            "how are markets",
-            "market status",
-            "market snapshot",
-            "best performing",
-            "worst performing",
-            "top gainers",
-            "top losers",
-            "trending",
-            "newly added",
-            "new coins",
-            "market overview",
-        ]
-        
-        has_summary_keyword = any(keyword in text_lower for keyword in summary_keywords)
-        
-        return has_summary_keyword
+        return looks_like_summary_request(text)
 
     async def _handle_market_summary(
         self,
@@ -600,25 +776,31 @@ class MarketAgent:
         task_id: str,
     ) -> TaskResult:
         """Handle market summary requests with comprehensive market data."""
+        # Imported lazily: only summary requests need this module
+        from utils.market_summary import get_comprehensive_market_summary, format_market_summary_text
         
         summary = await get_comprehensive_market_summary()
         
         summary_text = format_market_summary_text(summary)
         
+        # Response message, artifact and status message all carry the same text part.
+        # Everything below is built from trusted values, so pydantic validation is skipped.
+        text_part = MessagePart.model_construct(kind="text", text=summary_text)
+        
         # Step 1: Build response message (for conversation history display)
-        response_message = A2AMessage(
+        response_message = A2AMessage.model_construct(
             role="agent",
-            parts=[MessagePart(kind="text", text=summary_text)],
-            messageId=str(uuid4()),
+            parts=[text_part],
+            messageId=uuid4().hex,
             taskId=None,  
             metadata=None  
         )
         
         # Step 2: Build artifacts
         artifacts = [
-            Artifact(
+            Artifact.model_construct(
                 name="assistantResponse",
-                parts=[MessagePart(kind="text", text=summary_text)]
+                parts=[text_part]
             )
         ]
         
@@ -626,21 +808,21 @@ class MarketAgent:
         history = self._build_history(messages, response_message)
         
         # Step 4: Store context (like MoodMatch)
-        self.contexts[context_id] = history
+        self._remember_context(context_id, history)
         
         # Step 5: Create status message (A2A protocol compliance)
-        status_message = A2AMessage(
+        status_message = A2AMessage.model_construct(
             role="agent",
-            parts=[MessagePart(kind="text", text=summary_text)],
-            messageId=str(uuid4()),
+            parts=[text_part],
+            messageId=uuid4().hex,
             taskId=None,  
             metadata=None  
         )
         
-        task_status = TaskStatus(state="completed", message=status_message)
+        task_status = TaskStatus.model_construct(state="completed", message=status_message)
         
         # Step 6: Create successful task result
-        result = TaskResult(
+        result = TaskResult.model_construct(
             taskId=task_id,
             contextId=context_id,
             status=task_status,
@@ -667,88 +849,99 @@ class MarketAgent:
     ) -> str:
         """Format comprehensive analysis as user-friendly Markdown with all data sections."""
         
-        sections = []
+        buf = io.StringIO()
+        write = buf.write
         
         # Header
-        sections.append(f"**{key} Market Analysis**\n")
+        write(f"**{key} Market Analysis**\n\n")
         
         # Display errors prominently if present
         if error_messages:
-            sections.append("**Notices:**")
+            write("**Notices:**\n")
             for error in error_messages:
-                sections.append(f"- {error}")
-            sections.append("")
+                write(f"- {error}\n")
+            write("\n")
         
         # === MARKET OUTLOOK ===
-        sections.append("**Market Outlook**")
-        sections.append(f"- **Direction:** {direction.capitalize()}")
-        sections.append(f"- **Confidence Level:** {confidence:.0%}")
-        sections.append("")
-        
+        write(
+            "**Market Outlook**\n"
+            f"- **Direction:** {direction.capitalize()}\n"
+            f"- **Confidence Level:** {confidence:.0%}\n\n"
+            "**Price Information**\n"
+        )
+
         # === PRICE DATA ===
-        sections.append("**Price Information**")
+        # Price sentence reused by the overview, so each price is formatted once
+        price_sentence: str | None = None
         if symbol and price_snapshot.get("crypto"):
             crypto_price = price_snapshot["crypto"].get(symbol)
             if crypto_price:
                 price_str = f"${crypto_price:,.8f}".rstrip('0').rstrip('.')
-                sections.append(f"- **Current Price:** {price_str}")
+                write(f"- **Current Price:** {price_str}\n")
+                price_sentence = f"The asset is currently trading at {price_str}."
             else:
-                sections.append(f"- **Current Price:** Data unavailable")
+                write("- **Current Price:** Data unavailable\n")
         elif pair and price_snapshot.get("pair"):
             rate = price_snapshot["pair"].get("rate")
             if rate:
-                sections.append(f"- **Exchange Rate:** {rate:.4f}")
+                rate_str = f"{rate:.4f}"
+                write(f"- **Exchange Rate:** {rate_str}\n")
+                price_sentence = f"The pair is currently trading at {rate_str}."
             else:
-                sections.append(f"- **Exchange Rate:** Data unavailable")
+                write("- **Exchange Rate:** Data unavailable\n")
         else:
-            sections.append("- Price data not available")
-        sections.append("")
+            write("- Price data not available\n")
+        write("\n")
         
         # === TECHNICAL ANALYSIS ===
         if technical_data:
-            sections.append("**Technical Analysis (7-Day)**")
             change_pct = technical_data.get("change_pct", 0)
             trend = technical_data.get("trend", "unknown")
             signal = technical_data.get("signal", "neutral")
             price_position = technical_data.get("price_position", "N/A")
             
-            sections.append(f"- **Trend:** {trend.capitalize()}")
-            sections.append(f"- **Price Change:** {change_pct:+.2f}%")
-            sections.append(f"- **Signal:** {signal.capitalize()}")
-            sections.append(f"- **Position vs SMA:** {price_position.replace('_', ' ').title()}")
+            write(
+                "**Technical Analysis (7-Day)**\n"
+                f"- **Trend:** {trend.capitalize()}\n"
+                f"- **Price Change:** {change_pct:+.2f}%\n"
+                f"- **Signal:** {signal.capitalize()}\n"
+                f"- **Position vs SMA:** {price_position.replace('_', ' ').title()}\n"
+            )
             
             # Add support/resistance if available
             if technical_data.get("support") and technical_data.get("resistance"):
                 support = technical_data["support"]
                 resistance = technical_data["resistance"]
-                sections.append(f"- **Support Level:** ${support:,.2f}")
-                sections.append(f"- **Resistance Level:** ${resistance:,.2f}")
+                write(
+                    f"- **Support Level:** ${support:,.2f}\n"
+                    f"- **Resistance Level:** ${resistance:,.2f}\n"
+                )
             
-            sections.append("")
+            write("\n")
         
         # === AI ANALYSIS ===
         reasons_list = reasons if isinstance(reasons, list) else [str(reasons)]
-        if reasons_list and reasons_list[0] and reasons_list[0] != "rule-based fallback":
-            sections.append("**AI Insights**")
+        has_insights = bool(reasons_list and reasons_list[0] and reasons_list[0] != "rule-based fallback")
+        if has_insights:
+            write("**AI Insights**\n")
             for reason in reasons_list[:5]:  # Show up to 5 key factors
-                sections.append(f"- {reason}")
-            sections.append("")
+                write(f"- {reason}\n")
+            write("\n")
         
         # === NEWS HEADLINES ===
-        sections.append("**Recent News**")
+        write("**Recent News**\n")
         if news and len(news) > 0:
             for item in news[:3]:  # Top 3 headlines
                 title = item.get("title", "")
                 source = item.get("source", "Unknown")
                 if title:
-                    sections.append(f"- {title} ({source})")
+                    write(f"- {title} ({source})\n")
         else:
-            sections.append("- News are not currently available for this asset")
-        sections.append("")
+            write("- News are not currently available for this asset\n")
         
         # === OVERVIEW STATEMENT ===
         if not error_messages:
-            sections.append("**Overview**")
+            write("\n**Overview**\n")
             
             # Build a concise 3-4 sentence overview based on the analysis
             overview_parts = []
@@ -771,31 +964,25 @@ class MarketAgent:
                     overview_parts.append(f"Technical indicators reveal a {trend_desc} trend with a {change_pct:+.2f}% change over the past 7 days.")
             
             # Sentence 3: Price context (if available)
-            if symbol and price_snapshot.get("crypto"):
-                crypto_price = price_snapshot["crypto"].get(symbol)
-                if crypto_price:
-                    price_str = f"${crypto_price:,.8f}".rstrip('0').rstrip('.')
-                    overview_parts.append(f"The asset is currently trading at {price_str}.")
-            elif pair and price_snapshot.get("pair"):
-                rate = price_snapshot["pair"].get("rate")
-                if rate:
-                    overview_parts.append(f"The pair is currently trading at {rate:.4f}.")
+            if price_sentence:
+                overview_parts.append(price_sentence)
             
             # Sentence 4: Key insight from AI reasoning
-            if reasons_list and reasons_list[0] and reasons_list[0] != "rule-based fallback" and len(reasons_list) > 0:
+            if has_insights:
                 first_reason = reasons_list[0].strip()
                 if first_reason:
                     overview_parts.append(f"Key factor: {first_reason}")
             
-            sections.append("\n".join(overview_parts))
-            sections.append("")
+            write("\n".join(overview_parts))
         
         # === FOOTER ===
         if error_messages:
-            sections.append("**Tip:** Try common symbols like BTC, ETH, SOL or forex pairs like EUR/USD, GBP/USD")
+            write("\n**Tip:** Try common symbols like BTC, ETH, SOL or forex pairs like EUR/USD, GBP/USD")
         else:
-            sections.append("---")
-            sections.append("*This analysis is for informational purposes only and does not constitute financial advice.*")
+            write(
+                "\n\n---\n"
+                "*This analysis is for informational purposes only and does not constitute financial advice.*"
+            )
         
-        return "\n".join(sections)
+        return buf.getvalue()
 
@@ -21,18 +21,19 @@ import asyncio
 import json
 import logging
 import os
-import traceback
 import uuid
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from typing import Any, Awaitable, cast
 
 import httpx
+import orjson
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request, APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import TypeAdapter, ValidationError
 
 load_dotenv()
 
@@ -50,11 +51,19 @@ from models.a2a import (
     TaskResult,
     TaskStatus,
 )
-from utils.errors import A2AErrorCode, create_error_response
+from utils.errors import A2AErrorCode
+from utils.http_client import http_client
 from utils.redis_client import redis_store
 
+# Reused validator for the JSON-RPC envelope, built once at import
+_RPC_ADAPTER: TypeAdapter[JSONRPCRequest] = TypeAdapter(JSONRPCRequest)
 
-app = FastAPI(title="Market Intelligence A2A", version="1.0.0", docs_url="/docs")
+app = FastAPI(
+    title="Market Intelligence A2A",
+    version="1.0.0",
+    docs_url="/docs",
+    default_response_class=ORJSONResponse,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -69,12 +78,22 @@ system_router = APIRouter(tags=["System"])
 scheduler = AsyncIOScheduler()
 market_agent: MarketAgent | None = None
 
+# Maximum watchlist items analyzed at once by the scheduled job
+WATCHLIST_CONCURRENCY = int(os.getenv("WATCHLIST_CONCURRENCY", "8"))
+# Symbols analyzed by the scheduled job, parsed from WATCHLIST at startup
+watchlist: tuple[str, ...] = ()
+# Redis key holding the completion time of the last scheduled run, reported by /health
+SCHEDULER_LAST_RUN_KEY = "scheduler:last_run"
+
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    global market_agent
+    global market_agent, watchlist
 
     await redis_store.initialize()
     market_agent = MarketAgent()
+    watchlist = tuple(
+        symbol.strip() for symbol in os.getenv("WATCHLIST", "BTC,ETH,EUR/USD").split(",") if symbol.strip()
+    )
 
     poll_minutes = int(os.getenv("POLL_INTERVAL_MINUTES", "15"))
     scheduler.add_job(_scheduled_analysis_job, "interval", minutes=poll_minutes)
@@ -83,6 +102,9 @@ async def lifespan(_: FastAPI):
     shutdown_result = scheduler.shutdown()
     if asyncio.iscoroutine(shutdown_result):
         await cast(Awaitable[Any], shutdown_result)
+    if market_agent is not None:
+        await market_agent.close()
+    await http_client.close()
     await redis_store.close()
     market_agent = None
 
@@ -92,92 +114,124 @@ async def _scheduled_analysis_job() -> None:
     if market_agent is None:
         return
 
-    watchlist = [symbol.strip() for symbol in os.getenv("WATCHLIST", "BTC,ETH,EUR/USD").split(",") if symbol.strip()]
-    tasks = []
-    for item in watchlist:
-        message = A2AMessage(role="system", parts=[MessagePart(kind="text", text=f"Analyze {item}")])
-        tasks.append(
-            asyncio.create_task(
-                market_agent.process_messages(
-                    [message],
-                    context_id=f"scheduled-{item}",
-                    task_id=f"task-scheduled-{item}",
-                )
-            )
-        )
-
-    if not tasks:
+    agent = market_agent
+    if not watchlist:
         return
 
-    for task in asyncio.as_completed(tasks):
-        try:
-            await task
-        except Exception:  # pragma: no cover - logging fallback
-            traceback.print_exc()
+    # Bound concurrent analyses so a long watchlist does not flood upstream APIs
+    semaphore = asyncio.Semaphore(WATCHLIST_CONCURRENCY)
 
+    async def analyze(item: str) -> TaskResult:
+        # Fresh message (and messageId) per run; built from trusted values, so unvalidated
+        message = A2AMessage.model_construct(
+            role="system", parts=[MessagePart.model_construct(kind="text", text=f"Analyze {item}")]
+        )
+        async with semaphore:
+            return await agent.process_messages(
+                [message],
+                context_id=f"scheduled-{item}",
+                task_id=f"task-scheduled-{item}",
+            )
 
+    results = await asyncio.gather(*(analyze(item) for item in watchlist), return_exceptions=True)
+    for item, result in zip(watchlist, results):
+        if isinstance(result, Exception):  # pragma: no cover - logging fallback
+            logger.error(f"Scheduled analysis failed for {item}: {result}", exc_info=result)
 
-# Request Parsing & Validation
-async def _parse_request_body(request: Request) -> dict[str, Any] | JSONResponse:
-    """Parse and validate request body JSON."""
     try:
-        body = await request.json()
-        return body
+        await redis_store.client.set(SCHEDULER_LAST_RUN_KEY, datetime.now(timezone.utc).isoformat())
     except Exception as exc:
-        error_response = create_error_response(
-            request_id=None,
-            code=A2AErrorCode.PARSE_ERROR,
-            message="Parse error",
-            data={"details": str(exc)}
-        )
-        return JSONResponse(status_code=400, content=error_response)
+        logger.warning(f"Failed to record scheduled run: {exc}")
+
 
 
-async def _validate_jsonrpc_request(body: dict[str, Any], lenient: bool = False) -> JSONRPCRequest | JSONResponse:
-    """Validate JSON-RPC 2.0 request structure.
+# Request Parsing & Validation
+async def _read_jsonrpc_request(request: Request) -> JSONRPCRequest | JSONResponse:
+    """Parse and validate the JSON-RPC envelope, or build the matching error response.
     
-    Args:
-        body: Request body dictionary
-        lenient: Return errors as HTTP 200 with JSON-RPC error instead of HTTP 4xx
+    Well-formed requests are decoded and validated in a single pydantic-core
+    pass over the raw body. Only invalid ones are re-checked step by step so
+    the error names the specific problem.
     """
+    raw_body = await request.body()
     try:
-        rpc = JSONRPCRequest(**body)
-        return rpc
-    except Exception as exc:
-        request_id = body.get("id") if isinstance(body, dict) else None
-        
-        if lenient:
-            error_payload = {
+        return _RPC_ADAPTER.validate_json(raw_body)
+    except ValidationError:
+        pass
+    
+    try:
+        body = orjson.loads(raw_body)
+    except Exception as e:
+        logger.error(f"Invalid JSON in request: {e}")
+        return JSONResponse(
+            content={
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {
+                    "code": A2AErrorCode.PARSE_ERROR.value,
+                    "message": "Invalid JSON"
+                }
+            },
+            status_code=400
+        )
+    
+    if not isinstance(body, dict):
+        return JSONResponse(
+            content={
                 "jsonrpc": "2.0",
-                "id": request_id,
+                "id": None,
                 "error": {
                     "code": A2AErrorCode.INVALID_REQUEST.value,
-                    "message": "Invalid Request",
-                    "data": {"details": str(exc)}
+                    "message": "Request must be a JSON object"
                 }
-            }
-            return JSONResponse(status_code=200, content=error_payload)
-        else:
-            error_response = create_error_response(
-                request_id=request_id,
-                code=A2AErrorCode.INVALID_REQUEST,
-                message="Invalid Request",
-                data={"details": str(exc)}
-            )
-            return JSONResponse(status_code=400, content=error_response)
-
-
-def _create_internal_error_response(request_id: str, exc: Exception) -> JSONResponse:
-    """Create internal error response with traceback."""
-    tb = traceback.format_exc()
-    error_response = create_error_response(
-        request_id=request_id,
-        code=A2AErrorCode.INTERNAL_ERROR,
-        message="Internal error",
-        data={"details": str(exc), "trace": tb}
-    )
-    return JSONResponse(status_code=500, content=error_response)
-
+            },
+            status_code=400
+        )
+    
+    if body.get("jsonrpc") != "2.0":
+        return JSONResponse(
+            content={
+                "jsonrpc": "2.0",
+                "id": body.get("id"),
+                "error": {
+                    "code": A2AErrorCode.INVALID_REQUEST.value,
+                    "message": "Invalid JSON-RPC version, must be '2.0'"
+                }
+            },
+            status_code=400
+        )
+    
+    if "id" not in body:
+        return JSONResponse(
+            content={
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {
+                    "code": A2AErrorCode.INVALID_REQUEST.value,
+                    "message": "Missing required field 'id'"
+                }
+            },
+            status_code=400
+        )
+    
+    try:
+        rpc_request = _RPC_ADAPTER.validate_python(body)
+    except Exception as e:
+        logger.error(f"Failed to parse JSON-RPC request: {e}")
+        return JSONResponse(
+            content={
+                "jsonrpc": "2.0",
+                "id": body.get("id"),
+                "error": {
+                    "code": A2AErrorCode.INVALID_REQUEST.value,
+                    "message": "Invalid request format",
+                    "data": {"details": str(e)}
+                }
+            },
+            status_code=400
+        )
+    
+    return rpc_request
 
 
 # Request Handlers
@@ -308,78 +362,11 @@ async def a2a_endpoint(request: Request):
             status_code=500
         )
     
+    rpc_request: JSONRPCRequest | JSONResponse | None = None
     try:
-        try:
-            body = await request.json()
-        except Exception as e:
-            logger.error(f"Invalid JSON in request: {e}")
-            return JSONResponse(
-                content={
-                    "jsonrpc": "2.0",
-                    "id": None,
-                    "error": {
-                        "code": A2AErrorCode.PARSE_ERROR.value,
-                        "message": "Invalid JSON"
-                    }
-                },
-                status_code=400
-            )
-        
-        if not isinstance(body, dict):
-            return JSONResponse(
-                content={
-                    "jsonrpc": "2.0",
-                    "id": None,
-                    "error": {
-                        "code": A2AErrorCode.INVALID_REQUEST.value,
-                        "message": "Request must be a JSON object"
-                    }
-                },
-                status_code=400
-            )
-        
-        if body.get("jsonrpc") != "2.0":
-            return JSONResponse(
-                content={
-                    "jsonrpc": "2.0",
-                    "id": body.get("id"),
-                    "error": {
-                        "code": A2AErrorCode.INVALID_REQUEST.value,
-                        "message": "Invalid JSON-RPC version, must be '2.0'"
-                    }
-                },
-                status_code=400
-            )
-        
-        if "id" not in body:
-            return JSONResponse(
-                content={
-                    "jsonrpc": "2.0",
-                    "id": None,
-                    "error": {
-                        "code": A2AErrorCode.INVALID_REQUEST.value,
-                        "message": "Missing required field 'id'"
-                    }
-                },
-                status_code=400
-            )
-        
-        try:
-            rpc_request = JSONRPCRequest(**body)
-        except Exception as e:
-            logger.error(f"Failed to parse JSON-RPC request: {e}")
-            return JSONResponse(
-                content={
-                    "jsonrpc": "2.0",
-                    "id": body.get("id"),
-                    "error": {
-                        "code": A2AErrorCode.INVALID_REQUEST.value,
-                        "message": "Invalid request format",
-                        "data": {"details": str(e)}
-                    }
-                },
-                status_code=400
-            )
+        rpc_request = await _read_jsonrpc_request(request)
+        if isinstance(rpc_request, JSONResponse):
+            return rpc_request
         
         logger.info(f"Received {rpc_request.method} request (id: {rpc_request.id})")
         
@@ -411,21 +398,19 @@ async def a2a_endpoint(request: Request):
         
         logger.info(f"Request {rpc_request.id} completed successfully")
         
-        return JSONResponse(
-            content=response.model_dump(exclude_none=True, mode='json'),
+        # Serialize straight to JSON bytes in pydantic-core; with exclude_none this
+        # matches JSONRPCResponse.model_dump, which only drops the None field
+        return Response(
+            content=response.model_dump_json(exclude_none=True),
+            media_type="application/json",
             status_code=200
         )
         
     except Exception as e:
         logger.error(f"Unexpected error in a2a_endpoint: {e}", exc_info=True)
         
-        # Try to extract the request ID for error response
-        error_id = None
-        try:
-            request_body = await request.json()
-            error_id = request_body.get("id")
-        except:
-            pass
+        # Reuse the already-validated request ID instead of parsing the body again
+        error_id = rpc_request.id if isinstance(rpc_request, JSONRPCRequest) else None
         
         return JSONResponse(
             content={
@@ -447,83 +432,96 @@ async def health_check():
     """Health check endpoint."""
     ok: dict[str, Any] = {"status": "healthy", "dependencies": {}}
     try:
-        redis = redis_store.client
-        await redis.ping()  # type: ignore[func-returns-value]
+        # One round-trip for every probe, however many are added
+        pipe = redis_store.client.pipeline(transaction=False)
+        pipe.ping()
+        pipe.get(SCHEDULER_LAST_RUN_KEY)
+        _, last_run = await pipe.execute()
         ok["dependencies"]["redis"] = "ok"
+        ok["scheduler_last_run"] = last_run
     except Exception as exc:
         ok["dependencies"]["redis"] = f"error: {exc}"
     return ok
 
 
-@system_router.get("/agent.json")
-@system_router.get("/.well-known/agent.json")
-async def agent_manifest():
-    """Agent manifest for A2A protocol discovery."""
-    return {
-        "name": "Market Intelligence Agent",
-        "version": "1.0.0",
-        "publisher": "Market Intelligence Team",
-        "description": "Real-time market analysis agent for cryptocurrencies and forex pairs. Provides price tracking, technical analysis, news aggregation, and AI-powered market insights.",
-        "capabilities": [
-            "Real-time cryptocurrency price tracking (CoinGecko)",
-            "Forex pair analysis and exchange rates",
-            "Technical indicators (RSI, MACD, Bollinger Bands)",
-            "News aggregation from multiple sources",
-            "AI-powered market analysis and insights",
-            "Redis caching for performance (60s prices, 300s news)",
-            "Blocking/synchronous mode only (simplified implementation)"
-        ],
-        "endpoints": [
-            {
-                "method": "POST",
-                "path": "/a2a/agent/market",
-                "description": "Main A2A protocol endpoint for market analysis",
-                "protocol": "JSON-RPC 2.0",
-                "methods": [
-                    "message/send",
-                    "execute"
-                ]
-            },
-            {
-                "method": "GET",
-                "path": "/health",
-                "description": "Health check endpoint"
-            },
-            {
-                "method": "GET",
-                "path": "/agent.json",
-                "description": "Agent manifest (this endpoint)"
-            }
-        ],
-        "features": {
-            "supported_assets": [
-                "Cryptocurrencies (BTC, ETH, SOL, etc.)",
-                "Forex pairs (EUR/USD, GBP/USD, etc.)"
-            ],
-            "analysis_types": [
-                "Price tracking",
-                "Technical analysis",
-                "News aggregation",
-                "Market sentiment",
-                "AI insights"
-            ],
-            "caching": {
-                "price_data": "60 seconds",
-                "news_data": "300 seconds",
-                "forex_rates": "60 seconds"
-            }
+# Static A2A discovery manifest, serialized once at import
+AGENT_MANIFEST: dict[str, Any] = {
+    "name": "Market Intelligence Agent",
+    "version": "1.0.0",
+    "publisher": "Market Intelligence Team",
+    "description": "Real-time market analysis agent for cryptocurrencies and forex pairs. Provides price tracking, technical analysis, news aggregation, and AI-powered market insights.",
+    "capabilities": [
+        "Real-time cryptocurrency price tracking (CoinGecko)",
+        "Forex pair analysis and exchange rates",
+        "Technical indicators (RSI, MACD, Bollinger Bands)",
+        "News aggregation from multiple sources",
+        "AI-powered market analysis and insights",
+        "Redis caching for performance (60s prices, 300s news)",
+        "Blocking/synchronous mode only (simplified implementation)"
+    ],
+    "endpoints": [
+        {
+            "method": "POST",
+            "path": "/a2a/agent/market",
+            "description": "Main A2A protocol endpoint for market analysis",
+            "protocol": "JSON-RPC 2.0",
+            "methods": [
+                "message/send",
+                "execute"
+            ]
         },
-        "protocol": {
-            "version": "A2A/1.0",
-            "jsonrpc": "2.0",
-            "blocking_mode": True,
-            "non_blocking_mode": False,
-            "webhook_support": False
+        {
+            "method": "GET",
+            "path": "/health",
+            "description": "Health check endpoint"
         },
-        "contact": {
-            "support": "github.com/lexmanthefirst/forex-crypto-news-a2a-protocol"
+        {
+            "method": "GET",
+            "path": "/agent.json",
+            "description": "Agent manifest (this endpoint)"
+        }
+    ],
+    "features": {
+        "supported_assets": [
+            "Cryptocurrencies (BTC, ETH, SOL, etc.)",
+            "Forex pairs (EUR/USD, GBP/USD, etc.)"
+        ],
+        "analysis_types": [
+            "Price tracking",
+            "Technical analysis",
+            "News aggregation",
+            "Market sentiment",
+            "AI insights"
+        ],
+        "caching": {
+            "price_data": "60 seconds",
+            "news_data": "300 seconds",
+            "forex_rates": "60 seconds"
         }
+    },
+    "protocol": {
+        "version": "A2A/1.0",
+        "jsonrpc": "2.0",
+        "blocking_mode": True,
+        "non_blocking_mode": False,
+        "webhook_support": False
+    },
+    "contact": {
+        "support": "github.com/lexmanthefirst/forex-crypto-news-a2a-protocol"
     }
+}
+_AGENT_MANIFEST_JSON = orjson.dumps(AGENT_MANIFEST)
+
+
+@system_router.get("/agent.json")
+@system_router.get("/.well-known/agent.json")
+async def agent_manifest():
+    """Agent manifest for A2A protocol discovery."""
+    return Response(
+        content=_AGENT_MANIFEST_JSON,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=300"},
+    )
 
 
 
@@ -543,19 +541,20 @@ async def _process_with_agent(
     *,
     context_id: str | None = None,
     task_id: str | None = None,
-    config: Any | None = None,
+    config: dict[str, Any] | None = None,
 ) -> TaskResult:
-    """Process messages with the market agent."""
+    """Process messages with the market agent.
+
+    ``config`` is the already-validated params dict, passed through as-is.
+    """
     if market_agent is None:
         raise RuntimeError("MarketAgent is not initialized")
 
-    processed_config = config.dict() if (config is not None and hasattr(config, "dict")) else config
-
     return await market_agent.process_messages(
         messages=messages,
         context_id=context_id,
         task_id=task_id,
-        config=processed_config,
+        config=config,
     )
 
 
@@ -20,7 +20,7 @@ class A2AMessage(BaseModel):
     kind: Literal["message"] = "message"
     role: Literal["user", "agent", "system"]
     parts: List[MessagePart]
-    messageId: str = Field(default_factory=lambda: str(uuid4()))
+    messageId: str = Field(default_factory=lambda: uuid4().hex)
     contextId: Optional[str] = None
     taskId: Optional[str] = None
     timestamp: Optional[datetime] = None
@@ -82,7 +82,7 @@ class TaskStatus(BaseModel):
 
 class Artifact(BaseModel):
     """Artifact attached to a task."""
-    artifactId: str = Field(default_factory=lambda: str(uuid4()))
+    artifactId: str = Field(default_factory=lambda: uuid4().hex)
     name: str
     parts: List[MessagePart]
 
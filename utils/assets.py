@@ -131,16 +131,19 @@ CRYPTO_LOWER_MAP: dict[str, str] = {
 }
 
 # Common fiat currency codes used when parsing forex pairs.
-KNOWN_CURRENCY_CODES: set[str] = {
+KNOWN_CURRENCY_CODES: frozenset[str] = frozenset({
     "USD", "EUR", "GBP", "JPY", "AUD", "CAD", "CHF", "NZD",
     "CNY", "SEK", "NOK", "DKK", "SGD", "HKD", "KRW", "INR",
     "MXN", "ZAR", "TRY", "BRL", "RUB", "PLN", "THB", "MYR",
-}
+})
 
 
+@lru_cache(maxsize=4096)
 def get_coin_id(value: str | None) -> str | None:
     """Resolve a coin identifier from any known alias.
 
+    Results are memoized; the alias tables are immutable after import.
+
     Args:
         value: Symbol, name, or alias (case-insensitive).
 
@@ -187,6 +190,24 @@ def get_coin_metadata() -> list[dict[str, str]]:
     return metadata
 
 
+@lru_cache(maxsize=1)
+def _coin_symbols() -> dict[str, str]:
+    """Map CoinGecko ids to their uppercase display symbol (built once)."""
+    return {item["id"]: item["symbol"].upper() for item in get_coin_metadata()}
+
+
+def get_coin_symbol(coin_id: str) -> str:
+    """Return the display ticker for a CoinGecko id.
+
+    Args:
+        coin_id: CoinGecko identifier (e.g. ``bitcoin``).
+
+    Returns:
+        Uppercase ticker (e.g. ``BTC``), or the uppercased id when unknown.
+    """
+    return _coin_symbols().get(coin_id) or coin_id.upper()
+
+
 def _select_symbol(aliases: list[str]) -> str:
     """Pick the most plausible trading symbol from known aliases."""
     symbol_candidates = [alias for alias in aliases if alias.isalpha() and alias.upper() == alias and len(alias) <= 5]
@@ -216,5 +237,6 @@ __all__ = [
     "KNOWN_CURRENCY_CODES",
     "get_coin_id",
     "get_coin_metadata",
+    "get_coin_symbol",
     "iter_coin_aliases",
 ]
@@ -98,6 +98,10 @@ def redis_cache(ttl: int = 60) -> Callable[[Callable[..., Awaitable[T]]], Callab
             # Execute function if not in cache
             result = await func(*args, **kwargs)
             
+            # None reads back as a miss, so there is nothing worth storing
+            if result is None:
+                return result
+            
             if redis_available:
                 try:
                     await redis_store.set_cache(cache_key, result, ex=ttl)
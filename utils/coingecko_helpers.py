@@ -11,6 +11,8 @@ import os
 
 import httpx
 
+from utils.http_client import http_client
+
 logger = logging.getLogger(__name__)
 
 COINGECKO_BASE = os.getenv("COINGECKO_BASE", "https://api.coingecko.com/api/v3")
@@ -44,15 +46,14 @@ async def search_coin_id(symbol: str) -> str | None:
         params["x_cg_demo_api_key"] = COINGECKO_API_KEY
     
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(url, params=params, headers=headers)
-            
-            if response.status_code == 429:
-                logger.warning(f"[CoinGecko Search] Rate limited for symbol: {symbol}")
-                return None
-            
-            response.raise_for_status()
-            data = response.json()
+        response = await http_client.client.get(url, params=params, headers=headers)
+        
+        if response.status_code == 429:
+            logger.warning(f"[CoinGecko Search] Rate limited for symbol: {symbol}")
+            return None
+        
+        response.raise_for_status()
+        data = response.json()
         
         coins = data.get("coins", [])
         
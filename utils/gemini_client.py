@@ -4,6 +4,7 @@ import json
 import logging
 import os
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any
 from uuid import uuid4
 
@@ -11,11 +12,6 @@ from models.a2a import A2AMessage, Artifact, MessagePart, TaskResult, TaskStatus
 
 logger = logging.getLogger(__name__)
 
-try:  # pragma: no cover - optional dependency
-    from google import genai  # type: ignore
-except Exception:  # pragma: no cover - gracefully handle missing package
-    genai = None  # type: ignore
-
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
@@ -23,6 +19,16 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 logger.info(f"Gemini client initialized with model: {GEMINI_MODEL}")
 
 
+@lru_cache(maxsize=1)
+def _load_genai() -> Any | None:
+    """Import the Gemini SDK on first use; it is heavy and only needed for LLM calls."""
+    try:  # pragma: no cover - optional dependency
+        from google import genai  # type: ignore
+    except Exception:  # pragma: no cover - gracefully handle missing package
+        return None
+    return genai
+
+
 def _utc_now() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
@@ -92,7 +98,10 @@ def _default_analysis(news_summary: str) -> dict[str, Any]:
 
 
 def _generate_with_gemini(prompt: str, timeout: int) -> dict[str, Any]:
-    if not GEMINI_API_KEY or genai is None:
+    if not GEMINI_API_KEY:
+        return {}
+    genai = _load_genai()
+    if genai is None:
         return {}
     
     try:
@@ -131,6 +140,8 @@ def _generate_with_gemini(prompt: str, timeout: int) -> dict[str, Any]:
 def analyze_sync(subject: str, price_snapshot: dict[str, Any], news_summary: str, timeout: int = 20) -> TaskResult:
     prompt = _build_prompt(subject, price_snapshot, news_summary)
     payload = _generate_with_gemini(prompt, timeout)
+    # Rule-based and quota-exhausted verdicts are not worth reusing
+    fallback = not payload or bool(payload.get("quota_exceeded"))
 
     if not payload:
         payload = _default_analysis(news_summary)
@@ -143,30 +154,32 @@ def analyze_sync(subject: str, price_snapshot: dict[str, Any], news_summary: str
         "reasoning": reasoning,
     }
 
-    message = A2AMessage(
+    # Built from values produced above, so pydantic validation is skipped
+    message = A2AMessage.model_construct(
         role="agent",
         parts=[
-            MessagePart(kind="text", text="Gemini analysis complete."),
-            MessagePart(
+            MessagePart.model_construct(kind="text", text="Gemini analysis complete."),
+            MessagePart.model_construct(
                 kind="data",
                 data={
                     "analysis": analysis,
                     "subject": subject,
                     "price_snapshot": price_snapshot,
                     "timestamp": _utc_now(),
+                    "fallback": fallback,
                 },
             ),
         ],
     )
 
-    status = TaskStatus(state="completed", message=message)
+    status = TaskStatus.model_construct(state="completed", message=message)
 
-    artifact = Artifact(name=f"Gemini analysis for {subject}", parts=message.parts)
+    artifact = Artifact.model_construct(name=f"Gemini analysis for {subject}", parts=message.parts)
 
-    task_id = f"analysis-{uuid4()}"
+    task_id = f"analysis-{uuid4().hex}"
     context_id = f"context-{subject.lower().replace(' ', '-')}"
 
-    return TaskResult(
+    return TaskResult.model_construct(
         taskId=task_id,
         contextId=context_id,
         status=status,
@@ -187,7 +200,10 @@ def generate_text_sync(prompt: str, temperature: float = 0.7, timeout: int = 10)
     Returns:
         Generated text, or empty string on failure
     """
-    if not GEMINI_API_KEY or genai is None:
+    if not GEMINI_API_KEY:
+        return ""
+    genai = _load_genai()
+    if genai is None:
         return ""
     
     try:
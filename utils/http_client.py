@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import httpx
+
+# Default per-request timeout in seconds; callers may override it per call
+DEFAULT_TIMEOUT = 10.0
+
+
+class HttpClient:
+    """Process-wide ``httpx.AsyncClient`` so outbound calls reuse pooled connections."""
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 50,
+    ):
+        self._timeout = timeout
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created lazily so helpers also work outside the app lifespan (scripts, tests)
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self._timeout, limits=self._limits)
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+http_client = HttpClient()
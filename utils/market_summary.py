@@ -9,7 +9,7 @@ import os
 from datetime import datetime, timezone
 from typing import Any
 
-import httpx
+from utils.http_client import http_client
 
 COINGECKO_BASE = os.getenv("COINGECKO_BASE", "https://api.coingecko.com/api/v3")
 COINGECKO_API_KEY = os.getenv("COINGECKO_API_KEY", "")
@@ -36,10 +36,9 @@ async def get_top_cryptos_by_market_cap(limit: int = 10) -> list[dict[str, Any]]
         params["x_cg_demo_api_key"] = COINGECKO_API_KEY
     
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            data = response.json()
+        response = await http_client.client.get(url, params=params, headers=headers, timeout=15)
+        response.raise_for_status()
+        data = response.json()
         
         return data
     except Exception:
@@ -58,10 +57,9 @@ async def get_trending_cryptos() -> list[dict[str, Any]]:
         params["x_cg_demo_api_key"] = COINGECKO_API_KEY
     
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            data = response.json()
+        response = await http_client.client.get(url, params=params, headers=headers, timeout=15)
+        response.raise_for_status()
+        data = response.json()
         
         # Extract coin info from trending data
         trending = []
@@ -92,10 +90,9 @@ async def get_recently_added_cryptos(limit: int = 5) -> list[dict[str, Any]]:
         params["x_cg_demo_api_key"] = COINGECKO_API_KEY
     
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            data = response.json()
+        response = await http_client.client.get(url, params=params, headers=headers, timeout=15)
+        response.raise_for_status()
+        data = response.json()
         
         # Return limited results
         recently_added = data[:limit] if isinstance(data, list) else []
@@ -126,10 +123,9 @@ async def get_forex_majors_summary() -> list[dict[str, Any]]:
                 "apikey": ALPHAVANTAGE_KEY,
             }
             
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(ALPHAVANTAGE_BASE, params=params)
-                response.raise_for_status()
-                data = response.json()
+            response = await http_client.client.get(ALPHAVANTAGE_BASE, params=params)
+            response.raise_for_status()
+            data = response.json()
             
             rate_info = data.get("Realtime Currency Exchange Rate", {})
             if rate_info:
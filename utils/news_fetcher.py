@@ -9,6 +9,7 @@ from typing import Any, Iterable
 import httpx
 
 from utils.caching import redis_cache
+from utils.http_client import http_client
 from utils.assets import get_coin_id
 
 logger = logging.getLogger(__name__)
@@ -46,10 +47,9 @@ async def _search_coingecko_id(symbol: str) -> str | None:
         params["x_cg_demo_api_key"] = COINGECKO_API_KEY
     
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            data = response.json()
+        response = await http_client.client.get(url, params=params, headers=headers)
+        response.raise_for_status()
+        data = response.json()
         
         # Look for exact symbol match in coins
         coins = data.get("coins", [])
@@ -102,10 +102,9 @@ async def fetch_crypto_prices(symbols: Iterable[str]) -> dict[str, float]:
 
     logger.debug(f"Fetching crypto prices for {symbol_list} from CoinGecko...")
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            data = response.json()
+        response = await http_client.client.get(url, params=params, headers=headers)
+        response.raise_for_status()
+        data = response.json()
         logger.debug(f"CoinGecko response: {data}")
     except httpx.HTTPError as exc:
         logger.debug(f"CoinGecko API failed: {exc}")
@@ -143,10 +142,9 @@ async def fetch_forex_rate(pair: str) -> dict[str, Any]:
         "apikey": ALPHAVANTAGE_KEY,
     }
 
-    async with httpx.AsyncClient(timeout=10) as client:
-        response = await client.get(ALPHAVANTAGE_BASE, params=params)
-        response.raise_for_status()
-        data = response.json()
+    response = await http_client.client.get(ALPHAVANTAGE_BASE, params=params)
+    response.raise_for_status()
+    data = response.json()
 
     rate_info = data.get("Realtime Currency Exchange Rate")
     if not rate_info:
@@ -182,10 +180,9 @@ async def fetch_crypto_news(limit: int = 3) -> list[dict[str, Any]]:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+        response = await http_client.client.get(url, params=params)
+        response.raise_for_status()
+        data = response.json()
     except httpx.HTTPError as exc:
         return []
 
@@ -218,10 +215,9 @@ async def fetch_forex_news(limit: int = 5) -> list[dict[str, Any]]:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(NEWSAPI_BASE + "/everything", params=params)
-            response.raise_for_status()
-            data = response.json()
+        response = await http_client.client.get(NEWSAPI_BASE + "/everything", params=params)
+        response.raise_for_status()
+        data = response.json()
     except httpx.HTTPError as exc:
         return []
 
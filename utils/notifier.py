@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import json
 import logging
 from typing import Any, Mapping
 
-import httpx
+from utils.http_client import http_client
 
 
-async def send_console_notification(message: str) -> None:
+async def send_console_notification(payload: Mapping[str, Any] | str) -> None:
+    """Log a notification; structured payloads are serialized only when INFO is enabled."""
+    if not logging.getLogger().isEnabledFor(logging.INFO):
+        return
+    message = payload if isinstance(payload, str) else json.dumps(payload, default=str, separators=(",", ":"))
     logging.info("Market Notification: %s", message)
 
 
@@ -17,7 +22,7 @@ async def send_webhook_notification(
     auth: dict[str, Any] | None = None,
     timeout: float = 10.0,
 ) -> None:
-    """Send result to webhook URL"""
+    """Send result to webhook URL over the shared HTTP client."""
     headers = {"Content-Type": "application/json"}
     
     if token:
@@ -31,6 +36,5 @@ async def send_webhook_notification(
     
     logging.info(f"Sending webhook to {url}")
 
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        response = await client.post(url, json=payload_dict, headers=headers)
-        response.raise_for_status()
+    response = await http_client.client.post(url, json=payload_dict, headers=headers, timeout=timeout)
+    response.raise_for_status()
@@ -8,6 +8,8 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
 from utils.gemini_client import generate_text_sync
@@ -16,6 +18,12 @@ logger = logging.getLogger(__name__)
 
 PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
 
+# Extracted coins remembered per normalized query before the least recent is forgotten
+MAX_CACHED_EXTRACTIONS = 2048
+# Bounded LRU of extraction results; guarded by a lock since callers run on executor threads
+_extraction_cache: OrderedDict[str, str | None] = OrderedDict()
+_extraction_cache_lock = threading.Lock()
+
 
 def load_prompt(filename: str) -> str:
     """Load a prompt template from the prompts directory."""
@@ -26,12 +34,22 @@ def load_prompt(filename: str) -> str:
     return prompt_path.read_text(encoding="utf-8")
 
 
+class _TransientExtractionError(Exception):
+    """Raised for LLM failures that must not be memoized."""
+
+
+def _normalize_query(query: str) -> str:
+    """Normalize a query for cache lookups (lowercase, collapsed whitespace)."""
+    return " ".join(query.lower().split())[:256]
+
+
 def extract_coin_with_llm(query: str) -> str | None:
     """
     Extract cryptocurrency name/symbol from query using LLM.
     
     Uses a prompt-based approach that understands context and ignores
-    command words automatically.
+    command words automatically. Results are memoized per normalized
+    query, so repeated or near-identical queries skip the LLM call.
     
     Args:
         query: User query like "analyze ethereum" or "check BTC price"
@@ -47,32 +65,52 @@ def extract_coin_with_llm(query: str) -> str | None:
         >>> extract_coin_with_llm("hello there")
         None
     """
+    # Only the cache key is normalized; the model sees the query as written
+    cache_key = _normalize_query(query)
+    with _extraction_cache_lock:
+        if cache_key in _extraction_cache:
+            _extraction_cache.move_to_end(cache_key)
+            return _extraction_cache[cache_key]
+    
     try:
-        # Load prompt template
-        prompt_template = load_prompt("extract_coin.prompt")
-        if not prompt_template:
-            logger.error("Failed to load coin extraction prompt")
-            return None
-        
-        # Fill in the query
-        prompt = prompt_template.format(query=query)
-        
-        # Call Gemini with low temperature for consistent extraction
-        response = generate_text_sync(prompt, temperature=0.1, timeout=5)
-        
-        if not response:
-            logger.warning(f"Empty response from LLM for query: {query}")
-            return None
-        
-        result = response.strip().strip('"').strip("'").strip('`').strip()
-        
-        if result.upper() == "NONE" or not result or len(result) > 50:
-            logger.debug(f"No coin found in query: {query}")
-            return None
-        
-        logger.debug(f"Extracted coin '{result}' from query: {query}")
-        return result
-        
+        result = _extract_coin(query)
+    except _TransientExtractionError:
+        return None
     except Exception as e:
         logger.error(f"Failed to extract coin with LLM: {e}", exc_info=True)
         return None
+    
+    with _extraction_cache_lock:
+        _extraction_cache[cache_key] = result
+        _extraction_cache.move_to_end(cache_key)
+        if len(_extraction_cache) > MAX_CACHED_EXTRACTIONS:
+            _extraction_cache.popitem(last=False)
+    return result
+
+
+def _extract_coin(query: str) -> str | None:
+    """Run the LLM extraction; transient failures raise so they are not cached."""
+    # Load prompt template
+    prompt_template = load_prompt("extract_coin.prompt")
+    if not prompt_template:
+        logger.error("Failed to load coin extraction prompt")
+        raise _TransientExtractionError(query)
+    
+    # Fill in the query
+    prompt = prompt_template.format(query=query)
+    
+    # Call Gemini with low temperature for consistent extraction
+    response = generate_text_sync(prompt, temperature=0.1, timeout=5)
+    
+    if not response:
+        logger.warning(f"Empty response from LLM for query: {query}")
+        raise _TransientExtractionError(query)
+    
+    result = response.strip().strip('"').strip("'").strip('`').strip()
+    
+    if result.upper() == "NONE" or not result or len(result) > 50:
+        logger.debug(f"No coin found in query: {query}")
+        return None
+    
+    logger.debug(f"Extracted coin '{result}' from query: {query}")
+    return result
@@ -9,6 +9,8 @@ import redis.asyncio as aioredis
 from models.a2a import TaskResult
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+# Upper bound on pooled connections shared by all coroutines
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
 
 
 class RedisClient:
@@ -25,7 +27,8 @@ class RedisClient:
                 socket_connect_timeout=5,  # 5 second connection timeout
                 socket_timeout=5,  # 5 second operation timeout
                 retry_on_timeout=True,
-                health_check_interval=30
+                health_check_interval=30,
+                max_connections=REDIS_MAX_CONNECTIONS,
             )
 
     async def close(self) -> None:
@@ -41,14 +44,29 @@ class RedisClient:
 
     # Session helpers
     async def set_session(self, session_id: str, payload: dict[str, Any], ex: int = 3600) -> None:
-        await self.client.set(f"session:{session_id}", json.dumps(payload), ex=ex)
+        await self.client.set(f"session:{session_id}", json.dumps(payload, separators=(",", ":")), ex=ex)
 
     async def get_session(self, session_id: str) -> dict[str, Any] | None:
         raw = await self.client.get(f"session:{session_id}")
         return json.loads(raw) if raw else None
 
     async def set_latest_analysis(self, key: str, payload: dict[str, Any], ex: int = 3600) -> None:
-        await self.client.set(f"analysis:{key}", json.dumps(payload), ex=ex)
+        await self.client.set(f"analysis:{key}", json.dumps(payload, separators=(",", ":")), ex=ex)
+
+    async def set_latest_analysis_and_cache(
+        self,
+        key: str,
+        payload: dict[str, Any],
+        cache_key: str,
+        cache_value: Any,
+        ex: int = 3600,
+        cache_ex: int = 60,
+    ) -> None:
+        """Store the latest analysis and a cache entry in one pipelined round-trip."""
+        pipe = self.client.pipeline(transaction=False)
+        pipe.set(f"analysis:{key}", json.dumps(payload, separators=(",", ":")), ex=ex)
+        pipe.set(f"cache:{cache_key}", json.dumps(cache_value, default=str, separators=(",", ":")), ex=cache_ex)
+        await pipe.execute()
 
     async def get_latest_analysis(self, key: str) -> dict[str, Any] | None:
         raw = await self.client.get(f"analysis:{key}")
@@ -75,7 +93,7 @@ class RedisClient:
 
     async def set_cache(self, key: str, value: Any, ex: int = 60) -> None:
         """Set cached value with expiration time in seconds."""
-        await self.client.set(f"cache:{key}", json.dumps(value, default=str), ex=ex)
+        await self.client.set(f"cache:{key}", json.dumps(value, default=str, separators=(",", ":")), ex=ex)
 
 
 redis_store = RedisClient()
@@ -13,8 +13,10 @@ Features:
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
+from uuid import uuid4
 
 from models.a2a import A2AMessage
 from utils.redis_client import redis_store
@@ -28,6 +30,21 @@ SESSION_TTL = 86400
 MAX_MESSAGES_PER_SESSION = 50
 
 
+def text_message_dict(role: str, text: str) -> dict[str, Any]:
+    """
+    Build a stored text message without constructing an ``A2AMessage``.
+    
+    Produces the same shape as ``A2AMessage.model_dump(mode='json', exclude_none=True)``
+    for a single text part.
+    """
+    return {
+        "kind": "message",
+        "role": role,
+        "parts": [{"kind": "text", "text": text}],
+        "messageId": uuid4().hex,
+    }
+
+
 class SessionStore:
     """Manages conversation history for A2A sessions."""
     
@@ -42,6 +59,8 @@ class SessionStore:
         self.max_messages = max_messages
         self.ttl = ttl
         self._memory_fallback: dict[str, list[dict[str, Any]]] = {}
+        # Per-session append locks with their user counts, dropped once unused
+        self._append_locks: dict[str, tuple[asyncio.Lock, int]] = {}
     
     def _get_session_key(self, session_id: str) -> str:
         """Generate Redis key for session."""
@@ -57,18 +76,56 @@ class SessionStore:
             session_id: Unique session identifier
             message: A2A message to append
         """
-        import asyncio
+        await self.append_messages(session_id, [message])
+    
+    async def append_messages(self, session_id: str, messages: list[A2AMessage | dict[str, Any]]) -> None:
+        """
+        Append several messages to session history in one read/write cycle.
+        
+        The history is read once and written back once regardless of how
+        many messages are appended. Appends to the same session run one at a
+        time, so concurrent writers cannot overwrite each other's messages.
+        Enforces FIFO limit and refreshes TTL.
+        
+        Args:
+            session_id: Unique session identifier
+            messages: A2A messages or already-serialized message dicts
+                (e.g. from ``text_message_dict``), oldest first
+        """
+        if not messages:
+            return
+        
+        message_dicts = [
+            message if isinstance(message, dict) else message.model_dump(mode='json', exclude_none=True)
+            for message in messages
+        ]
+        
+        lock, users = self._append_locks.get(session_id, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._append_locks[session_id] = (lock, users + 1)
+        try:
+            async with lock:
+                await self._append_serialized(session_id, message_dicts)
+        finally:
+            lock, users = self._append_locks[session_id]
+            if users == 1:
+                del self._append_locks[session_id]
+            else:
+                self._append_locks[session_id] = (lock, users - 1)
+    
+    async def _append_serialized(self, session_id: str, message_dicts: list[dict[str, Any]]) -> None:
+        """Read, extend and write back one session's history; callers hold its append lock."""
         import json
         
         key = self._get_session_key(session_id)
-        message_dict = message.model_dump(mode='json', exclude_none=True)
         
         try:
-            # Get current history with timeout
-            history = await asyncio.wait_for(self.get_history(session_id), timeout=3.0)
+            # Get current history with timeout (copy so the memory fallback list is never mutated here)
+            history = list(await asyncio.wait_for(self.get_history(session_id), timeout=3.0))
             
-            # Append new message
-            history.append(message_dict)
+            # Append new messages
+            history.extend(message_dicts)
             
             # Enforce FIFO limit
             if len(history) > self.max_messages:
@@ -76,26 +133,25 @@ class SessionStore:
             
             # Set with timeout
             await asyncio.wait_for(
-                redis_store.client.set(key, json.dumps(history, default=str), ex=self.ttl),
+                redis_store.client.set(key, json.dumps(history, default=str, separators=(",", ":")), ex=self.ttl),
                 timeout=3.0
             )
             
-            logger.debug(f"Appended message to session {session_id} ({len(history)} total)")
+            logger.debug(f"Appended {len(message_dicts)} message(s) to session {session_id} ({len(history)} total)")
             
         except asyncio.TimeoutError:
             logger.warning(f"Redis timeout appending to session {session_id}, using memory fallback")
-            if session_id not in self._memory_fallback:
-                self._memory_fallback[session_id] = []
-            self._memory_fallback[session_id].append(message_dict)
-            if len(self._memory_fallback[session_id]) > self.max_messages:
-                self._memory_fallback[session_id] = self._memory_fallback[session_id][-self.max_messages:]
+            self._append_to_memory(session_id, message_dicts)
         except Exception as e:
             logger.warning(f"Failed to append message to Redis session {session_id}: {e}")
-            if session_id not in self._memory_fallback:
-                self._memory_fallback[session_id] = []
-            self._memory_fallback[session_id].append(message_dict)
-            if len(self._memory_fallback[session_id]) > self.max_messages:
-                self._memory_fallback[session_id] = self._memory_fallback[session_id][-self.max_messages:]
+            self._append_to_memory(session_id, message_dicts)
+    
+    def _append_to_memory(self, session_id: str, message_dicts: list[dict[str, Any]]) -> None:
+        """Append messages to the in-memory fallback, enforcing the FIFO limit."""
+        history = self._memory_fallback.setdefault(session_id, [])
+        history.extend(message_dicts)
+        if len(history) > self.max_messages:
+            self._memory_fallback[session_id] = history[-self.max_messages:]
     
     async def get_history(self, session_id: str) -> list[dict[str, Any]]:
         """
@@ -7,8 +7,8 @@ import asyncio
 import os
 from typing import Any
 
-import httpx
-
+from utils.caching import redis_cache
+from utils.http_client import http_client
 from utils.coingecko_helpers import search_coin_id
 from utils.assets import get_coin_id
 
@@ -40,10 +40,9 @@ async def fetch_price_history(symbol: str, days: int = 7) -> list[float]:
         params["x_cg_demo_api_key"] = COINGECKO_API_KEY
     
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            data = response.json()
+        response = await http_client.client.get(url, params=params, headers=headers)
+        response.raise_for_status()
+        data = response.json()
         
         # Extract closing prices from [timestamp, price] pairs
         prices = [price for _timestamp, price in data.get("prices", [])]
@@ -96,9 +95,23 @@ async def get_technical_summary(symbol: str) -> dict[str, Any]:
     """
     Get complete technical analysis summary.
     """
+    summary = await _cached_technical_summary(symbol)
+    if summary is None:
+        return {"error": "Unable to fetch price history"}
+    return summary
+
+
+@redis_cache(ttl=60)  # Cache technical summaries for 60 seconds, like prices
+async def _cached_technical_summary(symbol: str) -> dict[str, Any] | None:
+    """
+    Build the technical summary, or None when price history is unavailable.
+    
+    Failures return None, which the cache does not store, so a transient
+    fetch error is retried on the next call.
+    """
     prices = await fetch_price_history(symbol, days=7)
     if not prices:
-        return {"error": "Unable to fetch price history"}
+        return None
     
     indicators = calculate_indicators(prices)
     
@@ -14,7 +14,6 @@ from typing import Any
 
 # Regex patterns for cleaning
 _TAGS_RE = re.compile(r"<[^>]*>")
-_WS_RE = re.compile(r"\s+")
 
 
 def clean_html(raw: str) -> str:
@@ -29,11 +28,12 @@ def clean_html(raw: str) -> str:
     """
     if not raw:
         return ""
-    text = unescape(raw)
-    text = _TAGS_RE.sub(" ", text)
-    # Normalize whitespace
-    text = _WS_RE.sub(" ", text).strip()
-    return text
+    # Each pass only runs when the text can need it; plain chat text skips both
+    text = unescape(raw) if "&" in raw else raw
+    if "<" in text:
+        text = _TAGS_RE.sub(" ", text)
+    # Normalize whitespace (str.split uses the same whitespace set as \s)
+    return " ".join(text.split())
 
 
 def extract_conversation_history(params: dict[str, Any]) -> list[str]:
@@ -0,0 +1,222 @@
+"""
+Text Classification
+
+Pure, cached helpers that classify incoming request text: forex pair and
+coin extraction, market-summary detection, and HTML stripping. Kept free
+of agent state and fully annotated so the module can be compiled ahead of
+time (e.g. with mypyc) without changing callers.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from functools import lru_cache
+from html import unescape
+from typing import Iterable
+
+from utils.assets import CRYPTO_LOWER_MAP, KNOWN_CURRENCY_CODES, get_coin_id
+
+logger = logging.getLogger(__name__)
+
+
+def _trie_alternation(words: Iterable[str]) -> str:
+    """Build a regex alternation of ``words`` factored into a prefix trie.
+
+    At any position the longest listed word wins, exactly like a
+    longest-first ``|`` alternation, but the engine branches one character
+    at a time instead of retrying every word from each starting offset.
+    """
+    trie: dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if "" not in node:
+            return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + "|".join(branches) + ")?"
+
+    return build(trie)
+
+PAIR_RE = re.compile(r"([A-Za-z]{3,5})\s*[/\-]\s*([A-Za-z]{3,5})", re.ASCII)
+# Unseparated pairs like EURUSD: both halves must be known currency codes, validated by the regex itself
+_CURRENCY_ALT = _trie_alternation(KNOWN_CURRENCY_CODES)
+COMPACT_PAIR_RE = re.compile(rf"\b({_CURRENCY_ALT})({_CURRENCY_ALT})\b", re.IGNORECASE | re.ASCII)
+
+# Natural-language pair phrases. Earlier entries win when several appear in one message
+NATURAL_LANGUAGE_PAIRS: dict[str, str] = {
+    "euro dollar": "EUR/USD",
+    "euro usd": "EUR/USD",
+    "pound dollar": "GBP/USD",
+    "pound usd": "GBP/USD",
+    "dollar yen": "USD/JPY",
+    "usd yen": "USD/JPY",
+    "aussie dollar": "AUD/USD",
+    "aud usd": "AUD/USD",
+    "euro pound": "EUR/GBP",
+    "euro yen": "EUR/JPY",
+    "dollar cad": "USD/CAD",
+    "dollar canadian": "USD/CAD",
+}
+NATURAL_LANGUAGE_PAIR_RE = re.compile(_trie_alternation(NATURAL_LANGUAGE_PAIRS))
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# Full coin names from the alias table (len > 3, e.g. "bitcoin", "ethereum"), in table
+# order. Earlier entries win when several appear in one message
+COIN_NAMES: tuple[tuple[str, str], ...] = tuple(
+    (name, coin_id) for name, coin_id in CRYPTO_LOWER_MAP.items() if len(name) > 3
+)
+COIN_NAME_RE = re.compile(_trie_alternation(name for name, _ in COIN_NAMES))
+
+# Fallback hardcoded common names. Earlier entries win when several appear in one message
+FALLBACK_COIN_NAMES: dict[str, str] = {
+    "bitcoin": "bitcoin",
+    "ethereum": "ethereum",
+    "litecoin": "litecoin",
+    "ripple": "ripple",
+    "dogecoin": "dogecoin",
+    "cardano": "cardano",
+    "polkadot": "polkadot",
+    "solana": "solana",
+    "polygon": "matic-network",
+    "chainlink": "chainlink",
+    "avalanche": "avalanche-2",
+    "uniswap": "uniswap",
+    "cosmos": "cosmos",
+    "binance coin": "binancecoin",
+    "bnb": "binancecoin",
+    "tether": "tether",
+    "usdc": "usd-coin",
+}
+FALLBACK_COIN_RE = re.compile(_trie_alternation(FALLBACK_COIN_NAMES))
+
+# Common English words skipped during direct symbol matching. Stored
+# uppercase because tokens are taken from the uppercased message.
+SKIP_WORDS: frozenset[str] = frozenset(word.upper() for word in (
+    "analyze", "check", "what", "about", "tell", "me", "price", "of", "the",
+    "is", "are", "was", "were", "have", "has", "had", "do", "does", "did",
+    "will", "would", "should", "could", "can", "may", "might", "must",
+    "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "from",
+    "with", "by", "as", "this", "that", "these", "those", "it", "its",
+    "show", "get", "give", "take", "make", "go", "come", "see", "know",
+    "think", "say", "ask", "use", "find", "want", "need", "try",
+))
+
+# Keywords that indicate market summary requests
+SUMMARY_KEYWORDS: tuple[str, ...] = (
+    "summarize",
+    "summary",
+    "overview",
+    "what's happening",
+    "market update",
+    "today's market",
+    "movements today",
+    "market movements",
+    "how are markets",
+    "market status",
+    "market snapshot",
+    "best performing",
+    "worst performing",
+    "top gainers",
+    "top losers",
+    "trending",
+    "newly added",
+    "new coins",
+    "market overview",
+)
+# Searched against the lowercased text: IGNORECASE folds some non-ASCII letters differently
+SUMMARY_KEYWORD_RE = re.compile(_trie_alternation(SUMMARY_KEYWORDS))
+
+
+def strip_html(text: str) -> str:
+    """Remove HTML tags and decode entities."""
+    if "<" in text:
+        text = _TAG_RE.sub("", text)
+    if "&" in text:
+        text = unescape(text)
+    # str.split() uses the same whitespace set as \s and is much faster than a regex sub
+    return " ".join(text.split())
+
+
+@lru_cache(maxsize=4096)
+def _case_variants(text: str) -> tuple[str, str]:
+    """Return ``(lower, upper)`` copies of ``text``, shared by the extractors below."""
+    return text.lower(), text.upper()
+
+
+@lru_cache(maxsize=4096)
+def match_pair(text: str) -> str | None:
+    """Extract a forex pair such as ``EUR/USD`` from free text."""
+    # Every natural-language phrase contains a space, so one-word queries skip that scan.
+    # The alternation only rules out messages with no phrase in one pass; on a hit the
+    # phrases are checked in dict order so the first listed one wins, not the leftmost.
+    if " " in text:
+        text_lower = _case_variants(text)[0]
+        if NATURAL_LANGUAGE_PAIR_RE.search(text_lower):
+            for phrase, pair in NATURAL_LANGUAGE_PAIRS.items():
+                if phrase in text_lower:
+                    logger.info(f"[Natural language] Matched '{phrase}' -> '{pair}'")
+                    return pair
+    
+    m = PAIR_RE.search(text)
+    if m:
+        a, b = m.groups()
+        return f"{a.upper()}/{b.upper()}"
+    
+    m2 = COMPACT_PAIR_RE.search(text)
+    if m2:
+        return f"{m2.group(1).upper()}/{m2.group(2).upper()}"
+    
+    return None
+
+
+@lru_cache(maxsize=4096)
+def match_symbol_locally(text: str) -> str | None:
+    """Resolve a CoinGecko ID from free text without calling the LLM.
+
+    Tries the alias table per token, then full coin names, then the
+    fallback names. The LLM fallback lives in ``MarketAgent._extract_symbol``.
+    """
+    text_lower, text_upper = _case_variants(text)
+    
+    # Priority 1: Direct match using centralized alias table (very fast)
+    # Two str.replace calls plus split() beat a tokenizing regex by ~4x on short messages
+    for word in text_upper.replace(",", " ").replace(".", " ").split():
+        if len(word) < 2 or word in SKIP_WORDS:
+            continue
+
+        # Use assets.get_coin_id to resolve common aliases/symbols/names
+        coin_id = get_coin_id(word)
+        if coin_id:
+            logger.info(f"[Direct Match] '{word}' -> '{coin_id}'")
+            return coin_id
+    
+    # Priority 2: Full coin names. The alternation rules out messages with no name
+    # in one pass; on a hit the names are checked in table order.
+    if COIN_NAME_RE.search(text_lower):
+        for key, coin_id in COIN_NAMES:
+            if key in text_lower:
+                logger.info(f"[Name Match] Found '{key}' -> '{coin_id}'")
+                return coin_id
+    
+    # Priority 3: Fallback hardcoded common names. The alternation rules out messages
+    # with no name in one pass; on a hit the names are checked in dict order.
+    if FALLBACK_COIN_RE.search(text_lower):
+        for name, coin_id in FALLBACK_COIN_NAMES.items():
+            if name in text_lower:
+                logger.info(f"[Fallback] Matched '{name}' -> '{coin_id}'")
+                return coin_id
+
+    return None
+
+
+@lru_cache(maxsize=4096)
+def looks_like_summary_request(text: str) -> bool:
+    """Detect if the text asks for a market summary/overview."""
+    return SUMMARY_KEYWORD_RE.search(_case_variants(text)[0]) is not None